@@ -1,6 +1,7 @@
 import numpy as np
 import spitztimingrep
 import orbit
+import aorspec
 
 def diagnostics(info):
     """
@@ -9,8 +10,9 @@ def diagnostics(info):
 
     Parameters
     ----------
-    info : dict
-        A dictionary containing all AOR information (see auto_aor).
+    info : AORSpec or dict
+        The AOR specification (see aorspec), or a dictionary
+        containing all AOR information (see auto_aor).
 
     Returns
     -------
@@ -22,50 +24,15 @@ def diagnostics(info):
     2010-05-20  Christopher J. Campo, UCF (ccampo@gmail.com)
                 Initial version.
     """
-    # get the eclipse phase
-    if info['event'] == 'transit':
-        eclphase = info['eclphase'][0]
-    else:
-        eclphase = info['evphase']
-    
-    # get the error in eclipse phase
-    if info['phasecalc'] == True:
-        errphase = orbit.error_eclipse(info['e'][0], info['e'][1], info['omega'][0], info['omega'][1])
-        print("Eclipse phase and error calculated: {0} +/- {1}".format(info['evphase'], errphase))
-    elif info['eclphase'][1] == -1:
-        errphase = 0
-    else:
-        errphase = info['eclphase'][1]
-        
-    # eclipse times (assuming circular orbit)
-    ecltimes = spitztimingrep.spitztimingrep(info['planetname'],  # planet name
-                                             'eclipse',           # type of event
-                                             eclphase,            # orbit phase of eclipse
-                                             info['duration'],    # event duration
-                                             info['startwin'],    # start wime window
-                                             info['vis'],         # visibility windows
-                                             info['ttrans'],      # transit mid-time and error
-                                             info['period'],      # orbit period and error
-                                             info['toff'],        # offset time from ephemeris
-                                             info['ctrshift'],    # shift from event center
-                                             errphase=errphase,   # error in eclipse phase
-                                             type='midtimes'
-                                             )
-
-    # transit times (assuming circular orbit)
-    transtimes = spitztimingrep.spitztimingrep(info['planetname'], # planet name
-                                               'transit',          # type of event
-                                               0,                  # orbit phase of transit
-                                               info['duration'],   # event duration
-                                               info['startwin'],   # start wime window
-                                               info['vis'],        # visibility windows
-                                               info['ttrans'],     # transit mid-time and error
-                                               info['period'],     # orbit period and error
-                                               info['toff'],       # offset time from ephemeris
-                                               info['ctrshift'],   # shift from event center
-                                               errphase=errphase,  # error in eclphase
-                                               type='midtimes'
-                                               )
+    spec = aorspec.asspec(info)
+
+    # event times, from the AOR's calculation if it has one
+    events = getattr(spec, 'events', None)
+    if events is None:
+        events = eventtiming(spec)
+
+    ecltimes   = events['eclipse']['midtimes']
+    transtimes = events['transit']['midtimes']
 
     diagstr = """Filename of AOR generated:
 {0}
@@ -84,8 +51,88 @@ Object: {4}    Event: {5}
 
 Object: {7}    Event: {8}
 {9}
-""".format(info['filename'], info['tepname'], info['aainame'], info['visname'],
-           info['planetname'], 'ECLIPSE', ecltimes, info['planetname'], 'TRANSIT',
+""".format(spec.filename, spec.tepname, spec.aainame, spec.visname,
+           spec.planetname, 'ECLIPSE', ecltimes, spec.planetname, 'TRANSIT',
            transtimes)
 
     return diagstr
+
+def get_errphase(info):
+    """
+    Returns the error in eclipse phase of an AOR; calculated from
+    e and omega if the eclipse phase was calculated from them.
+
+    Parameters
+    ----------
+    info : AORSpec or dict
+        The AOR specification, or a dictionary containing all AOR
+        information (see auto_aor).
+
+    Returns
+    -------
+    errphase : scalar
+        The error in eclipse phase.
+    """
+    spec = aorspec.asspec(info)
+    if spec.phasecalc == True:
+        errphase = orbit.error_eclipse(spec.e[0], spec.e[1], spec.omega[0], spec.omega[1])
+        print("Eclipse phase and error calculated: {0} +/- {1}".format(spec.evphase, errphase))
+    elif spec.eclphase[1] == -1:
+        errphase = 0
+    else:
+        errphase = spec.eclphase[1]
+    return errphase
+
+def eventtiming(info, parts=('midtimes',)):
+    """
+    Calculates the eclipse and transit times of an AOR in one call to
+    spitztimingrep.eventtiming.  The orbit is circular unless
+    the AOR's eccorb holds the parameters of an eccentric orbit (see
+    eccorbphase.eccorbphase_windows).
+
+    Parameters
+    ----------
+    info : AORSpec or dict
+        The AOR specification, or a dictionary containing all AOR
+        information (see auto_aor).
+    parts : tuple or dict
+        Outputs to calculate; see spitztimingrep.eventtiming.
+
+    Returns
+    -------
+    events : dict
+        Output of spitztimingrep.eventtiming for the events 'eclipse'
+        and 'transit'.
+    """
+    spec = aorspec.asspec(info)
+
+    # get the eclipse phase
+    if spec.event == 'transit':
+        eclphase = spec.eclphase[0]
+    else:
+        eclphase = spec.evphase
+
+    # the eclipse/transit duration is only needed for the timing
+    # constraints; without it spitztimingrep uses the AOR duration
+    if type(parts) == dict:
+        wanted = [part for evparts in parts.values() for part in evparts]
+    else:
+        wanted = parts
+    ecldur = None
+    if ('ingress' in wanted or 'egress' in wanted) and getattr(spec, 'evdur', None) is not None:
+        ecldur = getattr(spec, spec.evdur)[0]
+
+    return spitztimingrep.eventtiming(spec.planetname,     # planet name
+                                      {'eclipse': eclphase, 'transit': 0.},  # event phases
+                                      spec.duration,       # event duration
+                                      spec.startwin,       # start wime window
+                                      spec.vis,            # visibility windows
+                                      spec.ttrans,         # transit mid-time and error
+                                      spec.period,         # orbit period and error
+                                      spec.toff,           # offset time from ephemeris
+                                      spec.ctrshift,       # shift from event center
+                                      errphase=get_errphase(spec),  # error in eclipse phase
+                                      ecldur=ecldur,       # eclipse/transit duration
+                                      parts=parts,
+                                      eccorb=getattr(spec, 'eccorb', None)  # eccentric orbit, if any
+                                      )
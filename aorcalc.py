@@ -240,7 +240,7 @@ def get_phase(info_dict):
                 print("Eclipse phase undefined! Calculating it from e and omega...")
                 phase = orbit.eclipse_phase(w, e)
                 print("Calculated phase value: {0}".format(phase))
-                info['phasecalc'] = True  # flag; phase is calculated
+                info_dict['phasecalc'] = True  # flag; phase is calculated
                 return phase
             else:
                 print("Eclipse phase undefined, as well as e and/or omega!")
@@ -265,42 +265,40 @@ def check_uncert(info_dict, uncertlist):
 
 def getduration(info, evdur):
     """
-    Calculate the eclipse or transit duration.
+    Calculate the eclipse or transit duration (in seconds).
     """
-    e  = info['e'][0]      # eccentricity
-    p  = info['period'][0] # period in SECONDS
-    w  = info['omega'][0]  # omega in RADIANS
-    ms = info['ms'][0]     # mstar in kg 
-    rs = info['rs'][0]     # rstar in m
-    rp = info['rp'][0]     # rp in m
-    i  = info['i'][0]      # inclination in rad
-    b  = info['impactpar'][0] # impact parameter
+    e   = info['e'][0]      # eccentricity
+    p   = info['period'][0] # period in DAYS
+    w   = info['omega'][0]  # omega in RADIANS
+    ms  = info['ms'][0]     # mstar in kg 
+    rs  = info['rs'][0]     # rstar in m
+    rp  = info['rp'][0]     # rp in m
+    inc = info['i'][0]      # inclination in rad
+    b   = info['impactpar'][0] # impact parameter
 
     pars     = [e, p, w, ms, rs, rp]
     parnames = ['eccentricity', 'period', 'omega', 'mstar', 'rstar', 'rplanet']
-    for i in range(len(pars)):
-        if pars[i] == -1:
-            print("Parameter {0} is undefined (-1)!!! Cannot calculate {1} duration!".format(parnames[i], evdur))
-            raise Exception("PLEASE SPECIFY PARAMETER {0} OR {1}!".format(parnames[i], evdur))
+    for k in range(len(pars)):
+        if pars[k] == -1:
+            print("Parameter {0} is undefined (-1)!!! Cannot calculate {1} duration!".format(parnames[k], evdur))
+            raise Exception("PLEASE SPECIFY PARAMETER {0} OR {1}!".format(parnames[k], evdur))
+    if inc == -1 and b == -1:
+        print("Parameters inclination and impactpar are undefined (-1)!!! Cannot calculate {0} duration!".format(evdur))
+        raise Exception("PLEASE SPECIFY PARAMETER inclination, impactpar, OR {0}!".format(evdur))
 
-    pars[1] *= 86400.      # seconds to days
     pars[2] *= 180./np.pi  # rad to deg
     pars[3] /= tc.msun     # kg to solar masses
 
-    if i == -1:
-        useb == True
-    else:
-        useb == False
-        pars[6] *= 180./np.pi  # rad to deg
+    # use the impact parameter if the inclination is unknown
+    useb = inc == -1
 
     # calculate duration for transit or eclipse
-    if evdur == 'ecldur':
-        ecltype = False
+    ecltype = evdur != 'ecldur'
 
     if useb:
         dur = orbit.duration(*pars, primary=ecltype, b=b) * 60.  # minutes to seconds
     else:
-        dur = orbit.duration(*pars, i=i, primary=ecltype) * 60.  # minutes to seconds
+        dur = orbit.duration(*pars, i=inc, primary=ecltype) * 60.  # minutes to seconds
 
     if dur == 0:
         raise Exception("ERROR CALCULATING {0}! Please specify {0} manually to continue!".format(evdur))
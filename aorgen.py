@@ -0,0 +1,708 @@
+# module with the steps of auto_aor as functions, so AORs can be
+# generated from a long-lived Python process instead of one run of the
+# auto_aor script per AOR.  STEP 1 and 2 take and return the master
+# `info` dictionary; from STEP 3 on, only the fields the AOR needs are
+# kept, in an aorspec.AORSpec.  No step modifies its input.
+import numpy   as np
+import rdfile  as rd
+import aorcalc
+import orbit
+import aorstr
+import aorspec
+import os
+import traceback
+import multiprocessing
+import functools
+import aor_diagnostics as aordiag
+import tepclass as tc
+import dec2sexa as d2s
+
+##########################################################
+# STEP 1 - Read and update all information about the AOR #
+##########################################################
+
+# tep files already loaded, by path
+teps = {}
+
+def load_tep(tepname, cache=True):
+    """
+    Read a tep file into a dictionary of (value, uncertainty) tuples,
+    in the units auto_aor uses: the period (and its uncertainty) in
+    days, and RA and Dec as sexagesimal strings (hh:mm:ss.ss and
+    dd:mm:ss.ss, without uncertainty).  The other values are in SI
+    units, as in the tep file.
+
+    Parameters
+    ----------
+    tepname : string
+        tep file name and path.
+    cache : bool
+        If True (default), the dictionary is kept in memory and the
+        file is only read again if it changed (size or modification
+        time).
+
+    Returns
+    -------
+    tep : dict
+        The tep values; a new dictionary on every call, so it can be
+        updated without changing the cache.
+    """
+    path = os.path.abspath(tepname)
+    stat = os.stat(path)
+    key  = (stat.st_size, stat.st_mtime)
+    if cache and path in teps and teps[path][0] == key:
+        return dict(teps[path][1])
+
+    tep = tc.tepfile(tepname)   # FINDME: ccampo 9/13/11 - using new tep reader
+
+    # every parameter of the tepfile object, with its uncertainty
+    tepdict = {}
+    for name, par in vars(tep).items():
+        if hasattr(par, 'val') and hasattr(par, 'uncert'):
+            try:
+                tepdict[name] = (float(par.val), float(par.uncert))
+            except ValueError:
+                tepdict[name] = (par.val, float(par.uncert))
+
+    # FINDME: ccampo 9/14/2011 tep files are in SI units
+    # convert period from seconds to days (undefined values stay -1)
+    tepdict['period'] = tuple([x if x == -1 else x/86400. for x in tepdict['period']])
+
+    # FINDME: ccampo 9/13/2011 new tep reader gives RA and DEC in radians
+    # convert RA and DEC back to HH:MM:SS format
+    ra  = d2s.dec2sexa1(tepdict['ra'][0]  * 12.0  / np.pi)
+    dec = d2s.dec2sexa1(tepdict['dec'][0] * 180.0 / np.pi)
+
+    # fix stupid negative sign issue (a space exists in the str instead of a zero)
+    if ra[0] == '-' and ra[1] == ' ':
+        ra = '-0' + ra[2:]
+    if dec[0] == '-' and dec[1] == ' ':
+        dec = '-0' + dec[2:]
+
+    tepdict['ra']  = ra.lstrip()   # remove beginning whitespace
+    tepdict['dec'] = dec.lstrip()
+
+    if cache:
+        teps[path] = (key, tepdict)
+    return dict(tepdict)
+
+def load_inputs(tepname, aainame, visname, viscache=False):
+    """
+    Read the tep, aai, and vis files of an AOR.
+
+    Parameters
+    ----------
+    tepname : string
+        tep file name and path.
+    aainame : string
+        aai file name and path.
+    visname : string
+        vis file name and path.
+    viscache : bool or string
+        Passed to rdfile.rdvis as `cache`; if set, the parsed vis
+        windows are cached in a binary file (see rdfile.rdvis).
+
+    Returns
+    -------
+    info : dict
+        Master dictionary containing ALL AOR information, as read
+        from the files (tep values as returned by `load_tep`).
+    """
+    # get the files
+    tepdict = load_tep(tepname)
+    aai     = rd.rdfile(aainame)
+    vis     = rd.rdvis(visname, juldat=True, cache=viscache)
+
+    # update the info
+    info = {}                        # master dictionary containing ALL AOR information
+    info['tepname'] = tepname        # filename of tep used in AOR 
+    info['aainame'] = aainame        # filename of aai used in AOR
+    info['visname'] = visname        # filename of vis used in AOR
+    info['vis']     = vis            # object's Spitzer visibility windows (JD)
+    info.update(tepdict)
+    info.update(aai)
+
+    return info
+
+def refit_ephemeris(info, times, errors):
+    """
+    Refit the transit ephemeris of an AOR to measured transit times
+    (see orbit.fit_ephemeris).
+
+    Parameters
+    ----------
+    info : dict
+        Master dictionary, as returned by `load_inputs`.
+    times : array_like
+        Measured transit mid-times (Julian day).
+    errors : array_like
+        Uncertainties of `times` (days).
+
+    Returns
+    -------
+    info : dict
+        Updated copy of the master dictionary, with the fitted
+        'ttrans' (less `toff`) and 'period' (in days), each with its
+        uncertainty, and their covariance matrix in 'ephcov'.
+    """
+    info = dict(info)
+    toff = info['toff']
+    ttrans, period, cov, epoch = orbit.fit_ephemeris(times, errors,
+                                                     info['period'][0],
+                                                     info['ttrans'][0] + toff)
+    info['ttrans'] = (ttrans[0] - toff, ttrans[1])
+    info['period'] = (period[0], period[1])
+    info['ephcov'] = cov
+    return info
+
+############################################
+# STEP 2 - Check and update default values #
+############################################
+
+def resolve_defaults(info):
+    """
+    Check the AOR information and fill in default and calculated
+    values (event phase, duration, number of frames, offsets, names,
+    etc.).
+
+    Parameters
+    ----------
+    info : dict
+        Master dictionary, as returned by `load_inputs`.
+
+    Returns
+    -------
+    info : dict
+        Updated copy of the master dictionary.
+    """
+    info = dict(info)
+
+    # remove uncertainties from fields that do not have any...
+    # ...unless it is one of these parameters
+    nouncert = ['ecldur', 'transdur', 'eclphase', 'pmra',
+                'pmdec', 'period', 'ttrans', 'e', 'omega',
+                'i', 'a']
+    for i in range(len(info.values())):
+        key = info.keys()[i]
+        try:
+            item = info[key]
+            if key not in nouncert:
+                if item[1] == -1:
+                    info[key] = item[0]
+        except:
+            continue
+
+    # check uncertainties per Joe's request
+    aorcalc.check_uncert(info, nouncert)
+
+    # add arbitrary offset in RA and DEC for co AOR if unspecified
+    if info['co_ra'] == -1 and info['co_dec'] == -1:
+        # for RA
+        co_ra      = info['ra'].split(':')
+        co_ra[-1]  = str(float(co_ra[-1]) + 10)
+        # for DEC
+        co_dec     = info['dec'].split(':')
+        co_dec[-1] = str(float(co_dec[-1]) + 10)
+
+        # check if over 60 seconds
+        if float(co_ra[-1]) >= 60:
+            co_ra[-1] = str(float(co_ra[-1]) - 60)
+            co_ra[-2] = str(int(co_ra[-2]) + 1)
+        if float(co_dec[-1]) >= 60:
+            co_dec[-1] = str(float(co_dec[-1]) - 60)
+            co_dec[-2] = str(int(co_dec[-2]) + 1)
+
+        # check if over 60 minutes
+        if float(co_ra[-2]) >= 60:
+            co_ra[-2] = str(float(co_ra[-2]) - 60)
+            co_ra[-3] = str(int(co_ra[-3]) + 1)
+        if float(co_dec[-2]) >= 60:
+            co_dec[-2] = str(float(co_dec[-2]) - 60)
+            co_dec[-3] = str(int(co_dec[-3]) + 1)
+
+        # final strings
+        co_ra  = co_ra[0] + ':' + co_ra[1] + ':' + co_ra[2]
+        co_dec = co_dec[0] + ':' + co_dec[1] + ':' + co_dec[2]
+        info['co_ra']  = co_ra
+        info['co_dec'] = co_dec
+
+    # default event to eclipse
+    if info['event'] == -1:
+        info['event'] = 'eclipse'
+
+    # calculate phase? flag.
+    info['phasecalc'] = False
+
+    # make sure transit phase is 0, otherwise calculate a phase
+    if info['event'] == 'transit':
+        info['evphase'] = 0.
+    else:
+        info['evphase']   = aorcalc.get_phase(info)
+
+    # eccentric, precessing orbit for the event times (aai switch
+    # 'eccentric'; see eccorbphase.eccorbphase_windows), else circular
+    if str(info.get('eccentric', 'no')).lower() == 'yes':
+        info['eccorb'] = eccentric_orbit(info)
+
+    # get the readout and overhead times
+    info['rdout'], info['overhead'] = aorcalc.exppars(info['readmode'],
+                                                      info['frametime'])
+
+    # get the event type
+    if info['event'] == 'eclipse':
+        evdur = 'ecldur'
+    elif info['event'] == 'transit':
+        evdur = 'transdur'
+    elif info['event'] == 'orbit':
+        pass #FINDME need to add
+    info['evdur'] = evdur
+
+    # get the duration (no uncertainty when calculated)
+    if info[evdur][0] == -1:
+        print("Parameter {0} not specified!  Calculating {0}...".format(evdur))
+        info[evdur] = (aorcalc.getduration(info, evdur), -1)
+
+    # calculate number of frames, duration
+    if info['nframes'] == -1 and info['duration'] == -1:    
+        # DURATION IS IN SECONDS
+        # duration is: start - 1hr --- dt --- evdur --- dt - end
+        # dt is a baseline time defined as max(evdur/2, 2hrs)
+        dt               = np.max((info[evdur][0]/2., 2*3600.))
+        info['duration'] = info[evdur][0] + 2*dt + 3600
+
+        # get the number of frames
+        info['nframes'] = aorcalc.get_nfrms(info['duration'],
+                                            info['frametime'],
+                                            info['rdout'],
+                                            info['overhead'])
+    elif info['nframes'] == -1 and info['duration'] != -1:  # get number of frames given duration
+        info['nframes'] = aorcalc.get_nfrms(info['duration'],
+                                            info['frametime'],
+                                            info['rdout'],
+                                            info['overhead'])
+    elif info['duration'] == -1 and info['nframes'] != -1:  # get duration given number of frames
+        info['duration'] = aorcalc.get_dur(info['nframes'],
+                                           info['frametime'],
+                                           info['rdout'],
+                                           info['overhead'])
+    else:
+        print('INVALID')
+        print('Duration and number of frames BOTH defined.  Please choose ONE to use and re-run auto_aor!')
+
+    # ALL TIMES IN SECONDS
+    # default start time window to a half hour
+    if info['startwin'] == -1:
+        info['startwin'] = 1800.   
+
+    # shift observation time by an hour to allow the 1hr chop
+    if info['ctrshift'] != None:
+        info['ctrshift'] += 3600.
+
+    # calculate offsets
+    if info['readmode'] == 'full_array':
+        if info['off_row'] == -1 and info['off_col'] == -1:
+            info['off_row'], info['off_col'] = aorcalc.get_offsets(info['chan'])
+    else:
+        # subarray doesn't have offsets
+        info['off_row'], info['off_col'] = (0., 0.)
+
+    # specify AOR names (aor and diagnostics)
+    # all AORs have a secondary observation (co) to check for hot pixels
+    info['aorname']  = info['planetname'].replace('-', '') + "-" + info['event'][:3] + "-ch" +\
+                       str(int(info['chan'])) + "-" + str(int(info['shotnum']))
+
+    # default AOR filenames
+    if info['filename'] == -1:
+        info['filename'] = info['aorname'] + "-auto.aor"
+
+    info['diagname'] = info['aorname'] + "-auto-diag.aao"
+
+    return info
+
+def eccentric_orbit(info):
+    """
+    Return the eccentric orbit of an AOR, as the keyword arguments of
+    eccorbphase.eccorbphase_windows: e, omega (degrees), the rate of
+    apsidal precession omega_dot (degrees per year; from the aai's
+    'omega_dot' if given, otherwise general relativity plus tides, see
+    orbit.precession_drift), and a and i for the light-time delay of
+    the eclipse, if the tep has them.
+
+    Parameters
+    ----------
+    info : dict
+        Master dictionary, as read by `load_inputs`.
+
+    Returns
+    -------
+    eccorb : dict
+        The orbit parameters.
+    """
+    e     = info['e'][0]
+    omega = info['omega'][0]
+    if e == -1 or omega == -1:
+        raise ValueError("Parameters e and omega are needed for an eccentric orbit.")
+    omega = omega * 180. / np.pi   # tep omega is in radians
+
+    # values with an undefined uncertainty were reduced to the value
+    value = lambda key: float(np.ravel(info.get(key, -1))[0])
+
+    omega_dot = value('omega_dot')
+    if omega_dot == -1:
+        # SI units of the tep to the units of orbit; missing terms are 0
+        ms, mp, rp = value('ms'), value('mp'), value('rp')
+        pars = np.array([ms / tc.msun, mp / orbit.mjupiter, rp / orbit.rjupiter])
+        pars[np.array([ms, mp, rp]) == -1] = np.nan
+        omega_gr, omega_tidal = orbit.precession_drift(pars[0], pars[1], pars[2],
+                                                       info['period'][0], e, omega, 0.)[:2]
+        omega_dot = float(np.nansum([omega_gr, omega_tidal]))
+
+    eccorb = {'e': e, 'omega': omega, 'omega_dot': omega_dot}
+    if info['a'][0] != -1:
+        eccorb['a'] = info['a'][0]
+    if info['i'][0] != -1:
+        eccorb['i'] = info['i'][0]
+
+    print("Eccentric orbit: e = {0}, omega = {1} deg, omega_dot = {2} deg/yr".format(
+        e, omega, omega_dot))
+    return eccorb
+
+#############################################
+# STEP 3 - Get timing data and generate AOR #
+#############################################
+
+def compute_timing(info):
+    """
+    Calculate the timing constraints of the AOR.
+
+    Parameters
+    ----------
+    info : dict
+        Master dictionary, as returned by `resolve_defaults`.
+
+    Returns
+    -------
+    spec : AORSpec
+        The fields of the master dictionary used from here on, with
+        the event times in events (see spitztimingrep.eventtiming),
+        and the timing constraints in tconst.
+    """
+    # only the fields used from here on
+    spec = aorspec.AORSpec.fromdict(info)
+
+    # eclipse and transit times for the diagnostics, and the timing
+    # constraints of the AOR's event, in one pass
+    parts = {'eclipse': ('midtimes',), 'transit': ('midtimes',)}
+    parts[spec.event] = ('midtimes', 'ingress')
+    spec.events = aordiag.eventtiming(spec, parts)
+
+    # get timing constraints
+    spec.tconst = spec.events[spec.event]['ingress']
+    return spec
+
+def render(spec, parts=False):
+    """
+    Make the AOR and diagnostics text.
+
+    Parameters
+    ----------
+    spec : AORSpec
+        The AOR, as returned by `compute_timing`.
+    parts : bool
+        If True, the AOR is left in pieces (see aorstr.aorparts) for
+        an aorstr.AORWriter, and the complete AOR text is not made.
+
+    Returns
+    -------
+    spec : AORSpec
+        Updated copy of the spec, with the AOR text in aor (or its
+        pieces in aorparts) and the diagnostics text in diagnostics.
+    """
+    spec = aorspec.AORSpec.fromdict(spec)
+
+    # write out diagnostics file (ephemeris)
+    spec.diagnostics = aordiag.diagnostics(spec)
+
+    # make aor
+    if parts:
+        spec.aorparts = aorstr.aorparts(spec)
+    else:
+        spec.aor = aorstr.aorstr(spec)
+
+    return spec
+
+##################################
+# STEP 4 - Print results to file #
+##################################
+
+def write_aor(spec):
+    """
+    Write the AOR and diagnostics (AAO) files of a rendered AOR to
+    the current working directory.
+
+    Parameters
+    ----------
+    spec : AORSpec
+        The AOR, as returned by `render`.
+    """
+    # write AOR file
+    AOR = open(spec.filename, 'w')
+    AOR.write(spec.aor)
+    AOR.close()
+
+    # write AAO file (diagnostics)
+    AAO = open(spec.diagname, 'w')
+    AAO.write(spec.diagnostics)
+    AAO.close()
+
+def generate_aor(tepname, aainame, visname, write=True, viscache=False):
+    """
+    Run STEP 1-4 for one AOR.
+
+    Parameters
+    ----------
+    tepname : string
+        tep file name and path.
+    aainame : string
+        aai file name and path.
+    visname : string
+        vis file name and path.
+    write : bool
+        If True (default), write the AOR and diagnostics files.
+    viscache : bool or string
+        vis window cache; see `load_inputs`.
+
+    Returns
+    -------
+    spec : AORSpec
+        The AOR (see `render`), including the AOR text (aor) and the
+        diagnostics text (diagnostics).
+
+    Examples
+    --------
+    >>> import aorgen
+    >>> spec = aorgen.generate_aor('HAT-P-16b.tep', 'HAT-P-16b.aai',
+    ...                            'HAT-P-16b.vis', write=False)
+    >>> print(spec.aor)
+    """
+    info = load_inputs(tepname, aainame, visname, viscache)
+    info = resolve_defaults(info)
+    spec = compute_timing(info)
+    spec = render(spec)
+    if write:
+        write_aor(spec)
+    return spec
+
+##############################################
+# CATALOG MODE - many targets in one process #
+##############################################
+
+def read_catalog(catname):
+    """
+    Return the list of (tep, aai, vis) file triples of a catalog.
+
+    Parameters
+    ----------
+    catname : string
+        Either a manifest file or a directory.  A manifest lists one
+        target per line as three white space separated file names
+        (tep, aai, vis); blank lines and lines starting with '#' are
+        ignored, and relative names are taken relative to the
+        manifest's directory.  A directory is searched (along with
+        its immediate subdirectories) for .aai files; each one is
+        paired with the .tep and .vis files of its own directory.
+        When there is more than one of those, the last in name order
+        (the most recent by naming convention) is used.
+
+    Returns
+    -------
+    targets : list
+        List of (tepname, aainame, visname) tuples.
+    """
+    targets = []
+
+    # manifest file
+    if not os.path.isdir(catname):
+        catdir = os.path.dirname(catname)
+        handle = open(catname, 'r')
+        for line in handle:
+            line = line.strip()
+            if len(line) < 1 or line[0] == '#':
+                continue
+            parts = line.split()
+            if len(parts) != 3:
+                raise ValueError("Bad catalog line (need tep, aai, and vis): {0}".format(line))
+            targets.append(tuple([os.path.join(catdir, part) for part in parts]))
+        handle.close()
+        return targets
+
+    # directory of targets
+    dirs = [catname] + [os.path.join(catname, d) for d in sorted(os.listdir(catname))
+                        if os.path.isdir(os.path.join(catname, d))]
+    for d in dirs:
+        files = sorted(os.listdir(d))
+        teps  = [f for f in files if f.endswith('.tep')]
+        aais  = [f for f in files if f.endswith('.aai')]
+        viss  = [f for f in files if f.endswith('.vis')]
+        for aai in aais:
+            if len(teps) == 0 or len(viss) == 0:
+                print("Skipping {0}: no .tep or .vis file in {1}".format(aai, d))
+                continue
+            targets.append((os.path.join(d, teps[-1]),
+                            os.path.join(d, aai),
+                            os.path.join(d, viss[-1])))
+    return targets
+
+def run_target(target, viscache=False, campaign=False):
+    """
+    Catalog worker; run `generate_aor` for one (tep, aai, vis) triple
+    without raising.  Returns (target, success flag, message), where
+    the message is the AOR filename or the error.  If campaign is set,
+    nothing is written and a fourth element is added: the AOR pieces
+    (see aorstr.aorparts) and diagnostics text, for an
+    aorstr.AORWriter (None on failure).
+    """
+    try:
+        if not campaign:
+            spec = generate_aor(*target, viscache=viscache)
+            return target, True, spec.filename
+        # the AOR pieces only; the writer joins them into its file
+        info = load_inputs(*target, viscache=viscache)
+        info = resolve_defaults(info)
+        spec = compute_timing(info)
+        spec = render(spec, parts=True)
+        return target, True, spec.filename, (spec.aorparts, spec.diagnostics)
+    except Exception:
+        msg = traceback.format_exc().strip().split('\n')[-1]
+        if campaign:
+            return target, False, msg, None
+        return target, False, msg
+
+def catalog(catname, nproc=None, viscache=False, campaign=None):
+    """
+    Run `generate_aor` over every target of a catalog in a pool of worker
+    processes, so numpy, scipy, etc. are only imported once per
+    worker.  A failing target is reported and does not stop the
+    others.
+
+    Parameters
+    ----------
+    catname : string
+        Manifest file or directory (see `read_catalog`).
+    nproc : int
+        Number of worker processes.  Default is the number of CPUs.
+    viscache : bool or string
+        vis window cache; see `load_inputs`.
+    campaign : string
+        If given, name of a single AOR file for the whole campaign.
+        The AORs are streamed into it (with aorstr.AORWriter) as the
+        targets finish, and their diagnostics into one AAO file of
+        the same name ending in '-diag.aao', instead of writing two
+        files per target.
+
+    Returns
+    -------
+    results : list
+        List of (target, success flag, message) tuples, in the order
+        the targets finished.
+    """
+    targets = read_catalog(catname)
+    results = []
+    worker  = functools.partial(run_target, viscache=viscache,
+                                campaign=campaign is not None)
+    writer  = None
+    pool    = multiprocessing.Pool(nproc)
+    try:
+        if campaign is not None:
+            writer = aorstr.AORWriter(campaign,
+                                      os.path.splitext(campaign)[0] + '-diag.aao')
+        for result in pool.imap_unordered(worker, targets):
+            target, ok, msg = result[:3]
+            if ok:
+                print("OK      {0}: {1}".format(target[1], msg))
+                if writer is not None:
+                    writer.write(*result[3])
+            else:
+                print("FAILED  {0}: {1}".format(target[1], msg))
+            results.append(result[:3])
+        pool.close()
+    finally:
+        # on an error or interrupt, stop the workers and flush what
+        # was written
+        pool.terminate()
+        pool.join()
+        if writer is not None:
+            writer.close()
+
+    nfail = len([r for r in results if not r[1]])
+    print("{0} of {1} AORs generated, {2} failed.".format(len(results) - nfail,
+                                                         len(results), nfail))
+    return results
+
+def drift_report(catname, years=1., k2p=0.3):
+    """
+    Project how far the eclipse times of every target of a catalog
+    drift, relative to the transits, over a planning horizon because
+    of apsidal precession (general relativity plus tides; see
+    orbit.precession_drift), and flag the targets whose drift exceeds
+    their start-time window.
+
+    Parameters
+    ----------
+    catname : string
+        Manifest file or directory (see `read_catalog`).
+    years : scalar
+        Planning horizon in years.
+    k2p : scalar
+        Love number of the planets.
+
+    Returns
+    -------
+    report : list
+        List of (aai file, planet name, GR precession (deg/yr), tidal
+        precession (deg/yr), drift (s), startwin (s), flag) tuples.
+        Targets missing any of ms, mp, rp, period, e, or omega have a
+        NaN drift and are not flagged.
+
+    Notes
+    -----
+    Only the tep and aai files are read; the precession terms of all
+    targets are then computed together in one call.
+    """
+    names   = []
+    pars    = []
+    for tepname, aainame, visname in read_catalog(catname):
+        try:
+            tep = load_tep(tepname)
+            aai = rd.rdfile(aainame)
+            startwin = aai.get('startwin', -1)
+        except Exception:
+            print("FAILED  {0}: {1}".format(aainame, traceback.format_exc().strip().split('\n')[-1]))
+            continue
+        names.append((aainame, tep['planetname'][0]))
+        pars.append([tep['ms'][0], tep['mp'][0], tep['rp'][0], tep['period'][0],
+                     tep['e'][0], tep['omega'][0], startwin])
+
+    # SI units of the tep files to the units of orbit, for all targets at once
+    pars = np.array(pars, dtype=np.float64).reshape((-1, 7))
+    pars[pars == -1] = np.nan
+    ms, mp, rp, period, e, omega, startwin = pars.T
+    startwin[np.isnan(startwin)] = 1800.  # default, as in resolve_defaults
+    omega_gr, omega_tidal, drift = orbit.precession_drift(ms / tc.msun, mp / orbit.mjupiter,
+                                                          rp / orbit.rjupiter, period,
+                                                          e, omega * 180. / np.pi, years, k2p)
+    with np.errstate(invalid='ignore'):
+        flag = np.abs(drift) > startwin
+
+    report = []
+    for k in range(len(names)):
+        if flag[k]:
+            status = 'DRIFT'
+        elif np.isnan(drift[k]):
+            status = 'NOPARS'
+        else:
+            status = 'OK'
+        print("{0:7s} {1}: eclipse drift {2:.1f} s in {3} yr (start window {4:.0f} s)".format(
+            status, names[k][1], drift[k], years, startwin[k]))
+        report.append(names[k] + (omega_gr[k], omega_tidal[k], drift[k], startwin[k], flag[k]))
+    return report
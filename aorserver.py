@@ -0,0 +1,188 @@
+# module with a long-running AOR service: an HTTP server on a localhost
+# port or a Unix socket that makes AORs on request, keeping the parsed
+# inputs, vis windows, and orbit solver results in memory between
+# requests, so a request only pays for the timing calculation.
+import os
+import json
+import hashlib
+import tempfile
+import traceback
+import aorgen
+import orbit
+try:
+    import BaseHTTPServer as httpserver
+    import SocketServer   as socketserver
+except ImportError:
+    import http.server    as httpserver
+    import socketserver
+
+# parsed inputs of the AORs already requested, by (tep, aai, vis) path,
+# with the size and modification time of the files when they were read
+inputs = {}
+
+# directory of the files written from request payloads
+payloaddir = os.path.join(tempfile.gettempdir(), 'aorserver-{0}'.format(os.getpid()))
+
+def load(tepname, aainame, visname):
+    """
+    Return the master dictionary of an AOR as read by
+    aorgen.load_inputs, from memory if none of the three files
+    changed since the last request that used them.
+    """
+    key   = (tepname, aainame, visname)
+    stats = [os.stat(fname) for fname in key]
+    stamp = [(stat.st_size, stat.st_mtime) for stat in stats]
+    if key not in inputs or inputs[key][0] != stamp:
+        inputs[key] = (stamp, aorgen.load_inputs(tepname, aainame, visname))
+    return dict(inputs[key][1])
+
+def payload(text, suffix):
+    """
+    Write a file sent in a request to the payload directory, named
+    after a hash of its contents (so the same contents are only
+    parsed once), and return its name.
+    """
+    if not isinstance(text, bytes):
+        text = text.encode('utf-8')
+    if not os.path.isdir(payloaddir):
+        os.makedirs(payloaddir)
+    fname = os.path.join(payloaddir, hashlib.md5(text).hexdigest() + suffix)
+    if not os.path.exists(fname):
+        tmp  = '{0}.tmp'.format(fname)
+        fout = open(tmp, 'wb')
+        fout.write(text)
+        fout.close()
+        os.rename(tmp, fname)
+    return fname
+
+def make_aor(request):
+    """
+    Make an AOR for a request.
+
+    Parameters
+    ----------
+    request : dict
+        The input files, as 'tep', 'aai', and 'vis' (file names and
+        paths on the server's machine) or 'tepdata', 'aaidata', and
+        'visdata' (the contents of the files; 'tep', etc. are then
+        only the names listed in the AOR), and optionally 'set',
+        a dictionary of aai values to use instead of those in the
+        aai file (e.g., {"startwin": 900, "ctrshift": 0}).
+
+    Returns
+    -------
+    response : dict
+        The AOR text ('aor'), the diagnostics text ('diagnostics'),
+        and the names the AOR and diagnostics files would have
+        ('filename' and 'diagname').  Nothing is written.
+    """
+    names = []
+    for kind in ('tep', 'aai', 'vis'):
+        if kind + 'data' in request:
+            names.append(payload(request[kind + 'data'], '.' + kind))
+        elif kind in request:
+            names.append(os.path.abspath(request[kind]))
+        else:
+            raise ValueError("Request has neither '{0}' nor '{0}data'.".format(kind))
+
+    info = load(*names)
+    info.update(request.get('set', {}))
+
+    # the AOR comments list the files by the names in the request
+    for kind, name in zip(('tep', 'aai', 'vis'), names):
+        info[kind + 'name'] = request.get(kind, name)
+
+    info = aorgen.resolve_defaults(info)
+    spec = aorgen.compute_timing(info)
+    spec = aorgen.render(spec)
+
+    return {'aor':         spec.aor,
+            'diagnostics': spec.diagnostics,
+            'filename':    spec.filename,
+            'diagname':    spec.diagname}
+
+class AORHandler(httpserver.BaseHTTPRequestHandler):
+    """
+    HTTP request handler.  POST /aor with a JSON request (see
+    `make_aor`) returns the JSON response, or {"error": message} with
+    status 400 if the AOR could not be made.  GET /status returns the
+    number of cached inputs and the orbit cache counters.
+    """
+    def do_POST(self):
+        if self.path.rstrip('/') != '/aor':
+            return self.reply(404, {'error': 'Unknown path {0}.'.format(self.path)})
+        try:
+            length  = int(self.headers.get('Content-Length', 0))
+            request = json.loads(self.rfile.read(length).decode('utf-8'))
+            self.reply(200, make_aor(request))
+        except Exception:
+            self.reply(400, {'error': traceback.format_exc().strip().split('\n')[-1]})
+
+    def do_GET(self):
+        if self.path.rstrip('/') != '/status':
+            return self.reply(404, {'error': 'Unknown path {0}.'.format(self.path)})
+        self.reply(200, {'inputs': len(inputs), 'orbitcache': orbit.cache_info()})
+
+    def reply(self, code, response):
+        body = json.dumps(response).encode('utf-8')
+        self.send_response(code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+class UnixHTTPServer(socketserver.UnixStreamServer):
+    """
+    HTTP server on a Unix socket.
+    """
+    def server_bind(self):
+        socketserver.UnixStreamServer.server_bind(self)
+        self.server_name = 'localhost'
+        self.server_port = 0
+
+    def get_request(self):
+        # Unix socket clients have no address; name them for the log
+        request, address = socketserver.UnixStreamServer.get_request(self)
+        return request, ('local', 0)
+
+def serve(port=8765, socket=None):
+    """
+    Run the AOR service until interrupted, on a localhost port or a
+    Unix socket.  The orbit cache (see orbit.enable_cache) is turned on.
+
+    Parameters
+    ----------
+    port : int
+        Port on 127.0.0.1 to listen on (default 8765).
+    socket : string
+        If given, name of a Unix socket to listen on instead of the
+        port.  An old socket file of that name is removed.
+
+    Examples
+    --------
+    >>> import aorserver
+    >>> aorserver.serve(8765)
+
+    And from the client:
+
+    curl -d '{"tep": "HAT-P-16b.tep", "aai": "HAT-P-16b.aai",
+              "vis": "HAT-P-16b.vis", "set": {"startwin": 900}}'
+         http://127.0.0.1:8765/aor
+    """
+    orbit.enable_cache()
+    if socket is None:
+        server = httpserver.HTTPServer(('127.0.0.1', port), AORHandler)
+        print("Serving AORs on http://127.0.0.1:{0}/aor".format(port))
+    else:
+        if os.path.exists(socket):
+            os.remove(socket)
+        server = UnixHTTPServer(socket, AORHandler)
+        print("Serving AORs on the Unix socket {0}".format(socket))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if socket is not None and os.path.exists(socket):
+            os.remove(socket)
@@ -0,0 +1,162 @@
+# module with a compact specification of a planned AOR: only the
+# fields of the master `info` dictionary that aorcalc,
+# spitztimingrep (through aor_diagnostics), aor_diagnostics, and
+# aorstr use, in a slotted object instead of a dictionary with every
+# tep and aai key.  aorgen holds a spec per AOR from compute_timing
+# on, and aor_diagnostics and aorstr read its fields as attributes.
+
+class AORSpec(object):
+    """
+    Specification of one AOR.  The fields are attributes (fast
+    access, no per-object dictionary), and can also be read and set
+    with string keys (spec['ra'], spec.get('eccorb'), 'events' in
+    spec), so code written for the master `info` dictionary also
+    works with a spec.  A field that was never set is missing,
+    as a key missing from a dictionary.
+
+    Attributes
+    ----------
+    tepname, aainame, visname, filename : string
+        Input files of the AOR and name of its AOR file.
+    planetname, aorname : string
+        Name of the planet, and label of the AOR.
+    mission, readmode : string
+        'warm' or 'cold', and 'full_array' or 'subarray'.
+    ra, dec, co_ra, co_dec : string
+        Coordinates of the target and of the co AOR (hh:mm:ss.ss and
+        dd:mm:ss.ss).
+    pmra, pmdec : tuple
+        Proper motion and uncertainty.
+    chan, frametime, nframes : scalar
+        IRAC channel, frame time, and number of frames.
+    off_row, off_col : scalar
+        IRAC row and column offsets.
+    event : string
+        'eclipse' or 'transit'.
+    evphase : scalar
+        Phase of the event.
+    phasecalc : bool
+        True if the eclipse phase was calculated from e and omega.
+    evdur : string
+        Name of the event duration field, 'ecldur' or 'transdur'.
+    ecldur, transdur, eclphase : tuple
+        Eclipse and transit durations (s) and eclipse phase, with
+        uncertainties.
+    ttrans, period : tuple
+        Transit time (less toff) and period, with uncertainties.
+    e, omega, i, a, impactpar : tuple
+        Orbit of the planet, with uncertainties (SI units).
+    ms, rs, rp : tuple
+        Star mass and radius, and planet radius (SI units).
+    duration, startwin, toff, ctrshift : scalar
+        Duration of the AOR (s), start time window (s), offset of
+        ttrans (days), and shift from the event center (s).
+    vis : ndarray
+        Visibility windows (Julian day).
+    events : dict
+        Event times (see spitztimingrep.eventtiming).
+    eccorb : dict
+        Eccentric orbit, if any (see aor_diagnostics.eventtiming).
+    tconst : list
+        Timing constraints of the AOR.
+    diagname : string
+        Name of the diagnostics file.
+    aor, diagnostics : string
+        AOR and diagnostics texts (see aorgen.render).
+    aorparts : list
+        Pieces of the AOR, if it was not joined (see aorstr.aorparts).
+    """
+    __slots__ = ('tepname', 'aainame', 'visname', 'filename',
+                 'planetname', 'aorname', 'mission', 'readmode',
+                 'ra', 'dec', 'co_ra', 'co_dec', 'pmra', 'pmdec',
+                 'chan', 'frametime', 'nframes', 'off_row', 'off_col',
+                 'event', 'evphase', 'phasecalc', 'evdur', 'ecldur',
+                 'transdur', 'eclphase', 'ttrans', 'period', 'e', 'omega',
+                 'i', 'a', 'impactpar', 'ms', 'rs', 'rp', 'duration',
+                 'startwin', 'toff', 'ctrshift', 'vis', 'events', 'eccorb',
+                 'tconst', 'diagname', 'aor', 'diagnostics', 'aorparts')
+
+    def __init__(self, **fields):
+        for key in fields:
+            setattr(self, key, fields[key])
+
+    @classmethod
+    def fromdict(cls, info):
+        """
+        Make a spec from the fields of a master dictionary (e.g., as
+        returned by aorgen.resolve_defaults) and ignore the other keys.
+        Given a spec, returns a copy of it.
+        """
+        spec = cls()
+        for key in cls.__slots__:
+            if key in info:
+                setattr(spec, key, info[key])
+        return spec
+
+    def todict(self):
+        """
+        Return the fields that are set, as a dictionary.
+        """
+        return dict([(key, getattr(self, key)) for key in self.__slots__
+                     if hasattr(self, key)])
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        setattr(self, key, value)
+
+    def __contains__(self, key):
+        return hasattr(self, key)
+
+    def get(self, key, default=None):
+        return getattr(self, key, default)
+
+    def __getstate__(self):
+        return self.todict()
+
+    def __setstate__(self, state):
+        for key in state:
+            setattr(self, key, state[key])
+
+    def __repr__(self):
+        return 'AORSpec({0})'.format(self.get('aorname'))
+
+def asspec(info):
+    """
+    Return `info` if it is a spec, otherwise a spec made from the
+    master dictionary `info` (see AORSpec.fromdict).
+    """
+    if isinstance(info, AORSpec):
+        return info
+    return AORSpec.fromdict(info)
+
+def columns(specs):
+    """
+    Return the fields of many specs as a columnar table for batch
+    rendering (see aorstr.aorbatch).
+
+    Parameters
+    ----------
+    specs : list
+        AORSpec objects (or master dictionaries).
+
+    Returns
+    -------
+    table : dict
+        One list per field, with one value per AOR; 'pmra' and
+        'pmdec' hold the values only (no uncertainties).  Fields
+        missing from any spec are left out.
+    """
+    specs = [asspec(spec) for spec in specs]
+    table = {}
+    for key in AORSpec.__slots__:
+        if all([hasattr(spec, key) for spec in specs]):
+            table[key] = [getattr(spec, key) for spec in specs]
+    for key in ('pmra', 'pmdec'):
+        if key in table:
+            table[key] = [pm[0] for pm in table[key]]
+    return table
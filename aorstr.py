@@ -1,4 +1,129 @@
 import datetime
+import string
+import numpy as np
+import aorspec
+
+# the body string as specifed strictly by SPOT
+BODY = """
+      AOT_TYPE:  IRAC {0}Mapping
+     AOR_LABEL:  {1}
+    AOR_STATUS:  new
+
+ MOVING_TARGET:  NO
+   TARGET_TYPE:  FIXED CLUSTER - OFFSETS
+   TARGET_NAME:  {2}
+  COORD_SYSTEM:  Equatorial J2000
+     POSITION1:  RA_LON={3}, DEC_LAT={4}, PM_RA={5:0.2}\", PM_DEC={6:0.2}\", EPOCH=2000.0
+     OFFSET_P2:  EAST_ROW_PERP={7:0.5}\", NORTH_COL_PARA={8:0.5}\"
+OFFSETS_IN_ARRAY:  YES
+OBSERVE_OFFSETS_ONLY:  YES
+OBJECT_AVOIDANCE:  EARTH = YES, OTHERS = YES
+
+          READOUT_MODE: {9}
+                 ARRAY: {10}
+       DATA_COLLECTION: {10}
+            HI_DYNAMIC: NO
+            FRAME_TIME: {11}
+        DITHER_PATTERN: TYPE=none
+ N_FRAMES_PER_POINTING: {12}
+SPECIAL:  IMPACT = none, LATE_EPHEMERIS = NO,SECOND_LOOK = NO
+{13}
+
+
+
+
+
+"""
+
+# the footer: chain constraint of the science and post AORs, and comments
+FOOTER = """CONSTRAINT: TYPE=CHAIN, NAME=ch-{0}
+AORS: AOR1={1},
+      AOR2={2}
+COMMENT_START:
+tep used: {3} 
+aai used: {4}
+vis used: {5}
+COMMENT_END:
+
+
+
+
+
+
+"""
+
+# the templates are parsed once, at import
+def _parse(template):
+    """
+    Split a template into (literal text, field number, format spec)
+    triples, once, so rendering only formats the fields.
+    """
+    return [(text, field and int(field), spec)
+            for text, field, spec, conv in string.Formatter().parse(template)]
+
+BODY_PARSED   = _parse(BODY)
+FOOTER_PARSED = _parse(FOOTER)
+
+def _column(x, n):
+    """
+    Make x a list of n values; scalars and strings are repeated, numpy
+    values become Python ones (so they print the same way).
+    """
+    if np.ndim(x) == 0:
+        if isinstance(x, np.generic):
+            x = x.item()
+        return [x] * n
+    if isinstance(x, np.ndarray):
+        return x.tolist()
+    return list(x)
+
+def _render(template, columns, n):
+    """
+    Format a parsed template for n AORs, a field at a time.  Returns
+    a list of columns of strings whose rows, joined, are the texts.
+    """
+    pieces = []
+    for text, field, spec in template:
+        pieces.append([text] * n)
+        if field is not None:
+            pieces.append(list(map(format, columns[field], [spec] * n)))
+    return pieces
+
+def _join(renders):
+    """
+    Join several rendered templates (see `_render`) AOR by AOR with a
+    single join.
+    """
+    columns = [column for render in renders for column in render]
+    k       = len(columns)
+    flat    = [None] * (k * len(columns[0]))
+    for j in range(k):
+        flat[j::k] = columns[j]
+    return ''.join(flat)
+
+def _bodycolumns(mission, aorlabel, targname, ra, dec, pmra, pmdec, offrow, offcol, readmode, chan, exptime, nfrms, tconst):
+    """
+    The columns of the fields of BODY; see `bodies`.
+    """
+    n = len(tconst)
+
+    # warm and cold missions have a few formatting differences
+    typestr  = ['' if m == 'cold' else 'Post-Cryo ' for m in _column(mission, n)]
+    arraystr = ['36u=YES, 45u=NO' if c == 1 else '36u=NO, 45u=YES'
+                for c in _column(chan, n)]
+
+    # make ra and dec into correct format
+    ra  = ['{0}h{1}m{2}s'.format(*r.split(':')) for r in _column(ra,  n)]
+    dec = ['{0}d{1}m{2}s'.format(*d.split(':')) for d in _column(dec, n)]
+
+    # make timing constraints strings
+    tconststr = ['\n'.join(lines) + '\n' if len(lines) else '' for lines in tconst]
+
+    return [typestr, _column(aorlabel, n), _column(targname, n), ra, dec,
+            _column(pmra, n), _column(pmdec, n), _column(offrow, n),
+            _column(offcol, n), [r.upper() for r in _column(readmode, n)],
+            arraystr, _column(exptime, n), _column(nfrms, n), tconststr]
+
 
 def header():
     """
@@ -87,59 +212,44 @@ def body(mission, aorlabel, targname, ra, dec, pmra, pmdec, offrow, offcol, read
     2010-05-20  Christopher J. Campo, UCF (ccampo@gmail.com)
                 Initial version.   
     """
-    # warm and cold missions have a few formatting differences
-    if mission == 'cold':
-        typestr  = ''
-    else:
-        typestr = 'Post-Cryo '
-        if chan == 1:
-            arraystr = '36u=YES, 45u=NO'
-        else:
-            arraystr = '36u=NO, 45u=YES'
-
-    # make ra and dec into correct format
-    ra  = ra.split(':')
-    ra  = ra[0] + "h" + ra[1] + "m" + ra[2] +"s"
-    dec = dec.split(':')
-    dec = dec[0] + "d" + dec[1] + "m" + dec[2] + "s"
-
-    # make timing constraints string
-    tconststr = ''
-    for line in tconst:
-        tconststr += line + '\n'
-    
-    # the body string as specifed strictly by SPOT
-    bodstr = """
-      AOT_TYPE:  IRAC {0}Mapping
-     AOR_LABEL:  {1}
-    AOR_STATUS:  new
-
- MOVING_TARGET:  NO
-   TARGET_TYPE:  FIXED CLUSTER - OFFSETS
-   TARGET_NAME:  {2}
-  COORD_SYSTEM:  Equatorial J2000
-     POSITION1:  RA_LON={3}, DEC_LAT={4}, PM_RA={5:0.2}\", PM_DEC={6:0.2}\", EPOCH=2000.0
-     OFFSET_P2:  EAST_ROW_PERP={7:0.5}\", NORTH_COL_PARA={8:0.5}\"
-OFFSETS_IN_ARRAY:  YES
-OBSERVE_OFFSETS_ONLY:  YES
-OBJECT_AVOIDANCE:  EARTH = YES, OTHERS = YES
-
-          READOUT_MODE: {9}
-                 ARRAY: {10}
-       DATA_COLLECTION: {10}
-            HI_DYNAMIC: NO
-            FRAME_TIME: {11}
-        DITHER_PATTERN: TYPE=none
- N_FRAMES_PER_POINTING: {12}
-SPECIAL:  IMPACT = none, LATE_EPHEMERIS = NO,SECOND_LOOK = NO
-{13}
-
+    columns = _bodycolumns(mission, aorlabel, targname, ra, dec, pmra, pmdec,
+                           offrow, offcol, readmode, chan, exptime, nfrms,
+                           [tconst])
+    bodstr  = ''.join([column[0] for column in _render(BODY_PARSED, columns, 1)])
+    return bodstr
 
+def bodies(mission, aorlabel, targname, ra, dec, pmra, pmdec, offrow, offcol, readmode, chan, exptime, nfrms, tconst):
+    """
+    Generate many SPOT compatible AOR bodies at once from columnar
+    inputs.  The template is parsed only once (at import), each
+    field is formatted a column at a time, and the bodies are put
+    together with a single join.
 
+    Parameters
+    ----------
+    mission, aorlabel, ..., nfrms : scalars, strings, or sequences
+        As in `body`, but each may be a sequence (list or ndarray)
+        with one value per AOR.  Scalars and strings are used for
+        every AOR.
+    tconst : sequence
+        One list of timing constraints (output of spitztimingrep) per
+        AOR.
 
+    Returns
+    -------
+    bodstr : string
+        All the AOR bodies, one after the other.
 
-""".format(typestr, aorlabel, targname, ra, dec, pmra, pmdec, offrow, offcol, readmode.upper(), arraystr, exptime, nfrms, tconststr)
-    return bodstr
+    Examples
+    --------
+    >>> bods = aorstr.bodies('warm', labels, labels, ras, decs, 0., 0.,
+    ...                      -0.352, 0.064, 'subarray', 1, 0.1, 2000,
+    ...                      tconsts)
+    """
+    columns = _bodycolumns(mission, aorlabel, targname, ra, dec, pmra, pmdec,
+                           offrow, offcol, readmode, chan, exptime, nfrms,
+                           tconst)
+    return _join([_render(BODY_PARSED, columns, len(tconst))])
 
 ###############################################################
 
@@ -170,102 +280,228 @@ def footer(sciname, postname, tepname, aainame, visname):
     2010-05-20  Christopher J. Campo, UCF (ccampo@gmail.com)
                 Initial version.          
     """
-    footstr = """
-CONSTRAINT: TYPE=CHAIN, NAME=ch-{0}
-AORS: AOR1={1},
-      AOR2={2}
-COMMENT_START:
-tep used: {3} 
-aai used: {4}
-vis used: {5}
-COMMENT_END:
-
-
-
-
-
-
-""".format(sciname, sciname, postname, tepname, aainame, visname)
-    footstr = footstr.lstrip() # remove extra whitespace
+    columns = [[x] for x in (sciname, sciname, postname, tepname, aainame, visname)]
+    footstr = ''.join([column[0] for column in _render(FOOTER_PARSED, columns, 1)])
     return footstr
 
 #########################################
 
-def aorstr(info):
+def aorparts(info):
     """
-    Return the complete AOR as a string which can be written
-    to a file.
+    Return the pieces of an AOR that follow the header: the science
+    body, the co body, and the footer with the chain constraint.
 
     Parameters
     ----------
-    info : dict
-        A dictionary containing all necessary information about
-        the AOR, contained in the tep, vis, and aai files.
+    info : AORSpec or dict
+        The AOR specification (see aorspec), or a dictionary
+        containing all necessary information about the AOR, contained
+        in the tep, vis, and aai files.
 
     Returns
     -------
-    aor : str
-        The complete AOR text in string format.
-        
-    Revisions
-    ---------
-    2010-05-20  Christopher J. Campo, UCF (ccampo@gmail.com)
-                Initial version.           
+    parts : list
+        The science body, co body, and footer strings, in the order
+        they appear in the AOR file.
     """
-    # aor header
-    head   = header()
+    spec = aorspec.asspec(info)
 
     # science AOR body
-    scibod = body(info['mission'],     # mission type (warm/cold)
-                  info['aorname'],     # label of aor
-                  info['aorname'],     # name of target
-                  info['ra'],          # ra of targ
-                  info['dec'],         # dec of targ
-                  info['pmra'][0],     # proper motion in ra
-                  info['pmdec'][0],    # proper motion in dec
-                  info['off_row'],     # row offsets
-                  info['off_col'],     # column offsets
-                  info['readmode'],    # array readout mode
-                  info['chan'],        # IRAC channel
-                  info['frametime'],   # exposure time
-                  info['nframes'],     # number of frames
-                  info['tconst'],      # timing constaints list
+    scibod = body(spec.mission,        # mission type (warm/cold)
+                  spec.aorname,        # label of aor
+                  spec.aorname,        # name of target
+                  spec.ra,             # ra of targ
+                  spec.dec,            # dec of targ
+                  spec.pmra[0],        # proper motion in ra
+                  spec.pmdec[0],       # proper motion in dec
+                  spec.off_row,        # row offsets
+                  spec.off_col,        # column offsets
+                  spec.readmode,       # array readout mode
+                  spec.chan,           # IRAC channel
+                  spec.frametime,      # exposure time
+                  spec.nframes,        # number of frames
+                  spec.tconst,         # timing constaints list
                   )
 
     # post AOR name
-    postname = info['aorname'] + '-co'
+    postname = spec.aorname + '-co'
 
     # subarray gets one cycle (64frm); full array gets 10 frames
-    if info['readmode'] == 'subarray':
+    if spec.readmode == 'subarray':
         postfrm = 1
     else:
         postfrm = 10
 
     # post AOR body
-    cobod  = body(info['mission'],     # mission type (warm/cold)
+    cobod  = body(spec.mission,        # mission type (warm/cold)
                   postname,            # label of aor
                   postname,            # name of target
-                  info['co_ra'],       # ra of targ
-                  info['co_dec'],      # dec of targ
+                  spec.co_ra,          # ra of targ
+                  spec.co_dec,         # dec of targ
                   0.0,                 # proper motion in ra  (none for co)
                   0.0,                 # proper motion in dec (diddo)
-                  info['off_row'],     # row offsets
-                  info['off_col'],     # column offsets
-                  info['readmode'],    # array readout mode
-                  info['chan'],        # IRAC channel
-                  info['frametime'],   # exposure time
+                  spec.off_row,        # row offsets
+                  spec.off_col,        # column offsets
+                  spec.readmode,       # array readout mode
+                  spec.chan,           # IRAC channel
+                  spec.frametime,      # exposure time
                   postfrm,             # number of frames (10 for co)
                   '',                  # no timing constraints for co
                   )
 
     # AOR footer
-    foot     = footer(info['aorname'],
+    foot     = footer(spec.aorname,
                       postname,
-                      info['tepname'],
-                      info['aainame'],
-                      info['visname'],
+                      spec.tepname,
+                      spec.aainame,
+                      spec.visname,
                       )
 
-    # the final aor
-    aor = head + scibod + cobod + foot
+    return [scibod, cobod, foot]
+
+def aorstr(info):
+    """
+    Return the complete AOR as a string which can be written
+    to a file.
+
+    Parameters
+    ----------
+    info : AORSpec or dict
+        The AOR specification, or a dictionary containing all
+        necessary information about the AOR (see `aorparts`).
+
+    Returns
+    -------
+    aor : str
+        The complete AOR text in string format.
+        
+    Revisions
+    ---------
+    2010-05-20  Christopher J. Campo, UCF (ccampo@gmail.com)
+                Initial version.           
+    """
+    # the final aor: header, science and co bodies, footer
+    aor = header() + ''.join(aorparts(info))
     return aor
+
+def aorbatch(aors):
+    """
+    Return many complete AORs (without the header; see `header`) as
+    one string, from columnar inputs.  Like `aorstr`, each AOR is its
+    science body, co body, and footer, but all are rendered a field
+    at a time from the parsed templates and put together with a
+    single join, for what-if studies of thousands of AORs.
+
+    Parameters
+    ----------
+    aors : dict
+        Columns of the AOR fields, with the keys of the master
+        dictionary used by `aorparts`: 'mission', 'aorname', 'ra',
+        'dec', 'pmra', 'pmdec', 'co_ra', 'co_dec', 'off_row',
+        'off_col', 'readmode', 'chan', 'frametime', 'nframes',
+        'tconst', 'tepname', 'aainame', and 'visname'.  Each is a
+        sequence with one value per AOR, or a scalar or string used
+        for all, except 'tconst', which is a list of timing
+        constraint lists.  'pmra' and 'pmdec' are the values only (no
+        uncertainties).
+
+    Returns
+    -------
+    aor : str
+        The AORs, one after the other.
+    """
+    n        = len(aors['tconst'])
+    aorname  = _column(aors['aorname'], n)
+    postname = [name + '-co' for name in aorname]
+
+    # subarray gets one cycle (64frm); full array gets 10 frames
+    readmode = _column(aors['readmode'], n)
+    postfrm  = [1 if mode == 'subarray' else 10 for mode in readmode]
+
+    # science bodies, co bodies (no proper motion or timing constraints)
+    sci  = _bodycolumns(aors['mission'], aorname, aorname, aors['ra'],
+                        aors['dec'], aors['pmra'], aors['pmdec'],
+                        aors['off_row'], aors['off_col'], readmode,
+                        aors['chan'], aors['frametime'], aors['nframes'],
+                        aors['tconst'])
+    co   = _bodycolumns(aors['mission'], postname, postname, aors['co_ra'],
+                        aors['co_dec'], 0.0, 0.0,
+                        aors['off_row'], aors['off_col'], readmode,
+                        aors['chan'], aors['frametime'], postfrm,
+                        [''] * n)
+    foot = [aorname, aorname, postname, _column(aors['tepname'], n),
+            _column(aors['aainame'], n), _column(aors['visname'], n)]
+
+    return _join([_render(BODY_PARSED,   sci,  n),
+                  _render(BODY_PARSED,   co,   n),
+                  _render(FOOTER_PARSED, foot, n)])
+
+#########################################
+
+class AORWriter(object):
+    """
+    Write the AORs of a whole campaign into a single SPOT file as
+    they are made: the header once, then the science body, co body,
+    and chain constraint of each AOR.  Nothing is kept in memory but
+    the file buffer.  Optionally, the diagnostics of every AOR are
+    written one after the other into a single AAO file.
+
+    Parameters
+    ----------
+    fname : string
+        Name of the AOR file.
+    diagname : string
+        Name of the diagnostics file (default: no diagnostics file).
+    bufsize : int
+        Buffer size of the files in bytes.
+
+    Examples
+    --------
+    >>> writer = aorstr.AORWriter('campaign.aor', 'campaign-diag.aao')
+    >>> for spec in specs:
+    ...     writer.add(spec)
+    >>> writer.close()
+    """
+    def __init__(self, fname, diagname=None, bufsize=65536):
+        self.fname    = fname
+        self.diagname = diagname
+        self.naor     = 0
+        self.aorfile  = open(fname, 'w', bufsize)
+        self.aorfile.write(header())
+        if diagname is None:
+            self.diagfile = None
+        else:
+            self.diagfile = open(diagname, 'w', bufsize)
+
+    def write(self, parts, diagnostics=None):
+        """
+        Write the pieces of one AOR (see `aorparts`) and, if there is
+        a diagnostics file, its diagnostics text.
+        """
+        self.aorfile.writelines(parts)
+        if self.diagfile is not None and diagnostics is not None:
+            self.diagfile.write(diagnostics)
+        self.naor += 1
+
+    def add(self, info):
+        """
+        Write the AOR of a spec or master dictionary (and its
+        diagnostics, if it has them).
+        """
+        spec = aorspec.asspec(info)
+        self.write(aorparts(spec), getattr(spec, 'diagnostics', None))
+
+    def close(self):
+        """
+        Flush and close the files.
+        """
+        self.aorfile.close()
+        if self.diagfile is not None:
+            self.diagfile.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
@@ -4,6 +4,11 @@
 # $HeadURL: file:///home/esp01/svn/code/auto_aor/trunk/caldat.py $
 # $Id: caldat.py 31 2009-06-18 13:55:27Z ccampo $
 
+import numpy as np
+
+months = ('Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun',
+          'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec')
+
 def caldat(juldate, verbose=False):
     """
 NAME:
@@ -45,22 +50,18 @@ MODIFICATION HISTORY:
      2009-01-06   0.1    Christopher Campo, UCF    Initial version
                          ccampo@gmail.com
     """
-    import numpy as np
 
     if type(juldate) == np.ndarray or type(juldate) == list \
             or type(juldate) == tuple:
-        date = []
-            
-        # loop through array; calculate the date for each
-        # index.
-        for i in range(len(juldate)):
-            if verbose == False:
-                date.append(get_date(juldate[i]))
-            else:
-                date.append(get_date(juldate[i], True))
-                
+        # calculate all of the dates at once, then split them
+        # into one tuple per index.
+        mm, dd, yyyy, h, min, sec = caldat_array(juldate)
+        if verbose == True:
+            mm = np.array(months)[mm - 1]
+
         # returns a 2D tuple of the dates calculated.
-        return tuple(date)
+        return tuple(zip(mm.tolist(), dd.tolist(), yyyy.tolist(),
+                         h.tolist(), min.tolist(), sec.tolist()))
     else:
         # the input is a scalar; only need to calculate for
         # one value. return is a tuple.
@@ -116,11 +117,63 @@ def get_date(jd, verbose=False):
     # the final date
     date = [mm, int(dd), yyyy, h, min, sec]
     
-    months = ('Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun',\
-                  'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec')
-    
     if verbose == False:
         return tuple(date)
     else:
         date[0] = months[mm - 1]
         return tuple(date)
+
+def caldat_array(juldate):
+    """
+NAME:
+      caldat_array
+
+PURPOSE:
+      Calculate the Gregorian dates of an array of Julian dates
+      all at once.  Gives the same values as get_date, element
+      by element.
+
+INPUTS:
+      juldate: The julian dates to be converted (scalar, list, tuple,
+               or array of any shape)
+
+OUTPUTS:
+     A tuple of six arrays, each with the shape of the input:
+     (mm, dd, yyyy, hh, mm, ss.ssss)
+
+     The first five are integer arrays; the seconds are floats.
+
+NOTES:
+     The same formulae as get_date, done on whole arrays instead
+     of one value at a time.  Integer truncation is done with
+     np.trunc (same as int()), and the integer division of alpha
+     by 4 with np.floor_divide (same as Python 2 int division).
+    """
+    jd = np.asarray(juldate, dtype=np.float64)
+    jd = jd + 0.5
+    z  = np.trunc(jd).astype(np.int64)
+    f  = jd - z
+
+    alpha = np.trunc((z - 1867216.25)/36524.25).astype(np.int64)
+
+    a = z + 1 + alpha - np.floor_divide(alpha, 4)
+    b = a + 1524
+    c = np.trunc((b - 122.1)/365.25).astype(np.int64)
+    d = np.trunc(365.25 * c).astype(np.int64)
+    e = np.trunc((b - d)/30.6001).astype(np.int64)
+
+    # day of the month (dd)
+    dd = b - d - np.trunc(30.6001 * e).astype(np.int64) + f
+
+    # month number (mm) and year (yyyy)
+    mm   = np.where(e < 13.5, e - 1, e - 13)
+    yyyy = np.where(mm > 2.5, c - 4716, c - 4715)
+
+    # hour, minute, second
+    ddi  = np.trunc(dd).astype(np.int64)
+    frac = dd - ddi
+    h    = np.trunc(frac * 24).astype(np.int64)
+    min  = np.trunc(((frac * 24) - h) * 60).astype(np.int64)
+    sec  = 86400 * frac - h * 3600 - min * 60
+
+    return mm, ddi, yyyy, h, min, sec
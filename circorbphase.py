@@ -120,3 +120,123 @@ MODIFICATION HISTORY:
     error     = error[indices]
 
     return np.array((event, error))
+
+def circorbphase_windows(teph, period, obswin, toff=0, evphase=0, errphase=0):
+    """
+NAME:
+      circorbphase_windows
+
+PURPOSE:
+      Same as circorbphase, but for a whole set of observing windows
+      at once.  All event epochs are computed with one arange and
+      matched to the windows with searchsorted, instead of calling
+      circorbphase once per window.  THE ORBIT IS ASSUMED CIRCULAR!
+
+INPUTS:
+      teph:     Time of transit and error; 2-element array (Julian day)
+
+      period:   Period of planet and error; 2-element array (days)
+
+      obswin:   [nwin,2] array of Julian dates for the start and end
+                of each observing window.  Windows must not overlap.
+
+      toff:     Optional parameter; added to teph to get julian date.
+                (days, default is 0)
+
+      evphase:  Optional parameter; phase of event to calculate
+                (default 0 - primary eclipse)
+
+      errphase: Optional parameter; error in evphase.
+
+OUTPUTS:
+      Returns a tuple (ecl, index).  ecl is the array of orbital event
+      Julian dates and their errors (same as circorbphase, for all
+      windows), and index is the index in obswin of the window each
+      event falls in.  Events are ordered by window, then by time, as
+      if circorbphase were called on each window in turn.
+
+MODIFICATION HISTORY:
+      Based on circorbphase.
+
+    """
+    import numpy as np
+
+    obswin = np.asarray(obswin, dtype=np.float64).reshape((-1, 2))
+    if len(obswin) == 0:
+        return np.zeros((2, 0)), np.zeros(0, dtype=int)
+
+    # windows in order of start time
+    order  = np.argsort(obswin[:, 0], kind='mergesort')
+    starts = obswin[order, 0]
+    ends   = obswin[order, 1]
+    start  = starts[0]
+    last   = ends.max()
+
+    # phase of the first start time, as in circorbphase
+    div    = (start - toff - teph[0]) / period[0]
+    ephase = evphase % 1
+    if div < 0:
+        phasestart = div % -1.
+    else:
+        phasestart = div % 1.
+
+    phadj  = ephase - phasestart
+    phadj -= np.ceil(phadj)
+    phadj -= 1.
+
+    # every event from before the first start to after the last end
+    first = start + phadj * period[0]
+    nev   = np.ceil((last-start) / period[0]) + 2
+    event = first + (period[0] * np.arange(0, nev, 1, dtype=np.float64))
+
+    event, index = windowindex(event, obswin)
+
+    error = np.sqrt((period[1] * (event - (toff + teph[0])) / period[0])**2\
+                         + teph[1]**2 + (period[0]*errphase)**2)
+
+    return np.array((event, error)), index
+
+def windowindex(event, obswin):
+    """
+NAME:
+      windowindex
+
+PURPOSE:
+      Finds the observing window that each of a set of event times
+      falls in (with searchsorted, for all events at once) and drops
+      the events outside of every window.
+
+INPUTS:
+      event:    Array of event Julian dates
+
+      obswin:   [nwin,2] array of Julian dates for the start and end
+                of each observing window.  Windows must not overlap.
+
+OUTPUTS:
+      Returns a tuple (event, index) of the events inside a window
+      and the index in obswin of that window, ordered by window,
+      then by time.
+
+MODIFICATION HISTORY:
+      Split out of circorbphase_windows.
+
+    """
+    import numpy as np
+
+    obswin = np.asarray(obswin, dtype=np.float64).reshape((-1, 2))
+    event  = np.asarray(event, dtype=np.float64)
+    order  = np.argsort(obswin[:, 0], kind='mergesort')
+    starts = obswin[order, 0]
+    ends   = obswin[order, 1]
+
+    # the last window starting before each event; keep the event
+    # if that window has not ended yet.
+    k      = np.searchsorted(starts, event, side='left') - 1
+    kk     = np.where(k >= 0, k, 0)
+    inside = (k >= 0) & (event < ends[kk])
+    event  = event[inside]
+    index  = order[k[inside]]
+
+    # order by window, then time
+    sort  = np.lexsort((event, index))
+    return event[sort], index[sort]
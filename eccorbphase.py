@@ -0,0 +1,116 @@
+import numpy as np
+import circorbphase as cop
+import orbit
+
+def eccorbphase_windows(teph, period, obswin, e, omega, omega_dot=0, toff=0,
+                        event='transit', errphase=0, a=None, i=np.pi/2):
+    """
+NAME:
+      eccorbphase_windows
+
+PURPOSE:
+      Same as circorbphase_windows, but for an eccentric orbit that
+      may precess.  Calculates the times of transit or secondary
+      eclipse, for every epoch in a set of observing windows at once,
+      from the time of a transit, the period, e, omega, and the rate
+      of apsidal precession.  Optionally adds the light-time delay of
+      the eclipse.
+
+INPUTS:
+      teph:      Time of transit and error; 2-element array (Julian day)
+
+      period:    Period of planet (between transits) and error;
+                 2-element array (days)
+
+      obswin:    [nwin,2] array of Julian dates for the start and end
+                 of each observing window.  Windows must not overlap.
+
+      e:         Eccentricity
+
+      omega:     Longitude of periastron at the time teph (degrees)
+
+      omega_dot: Optional parameter; rate of apsidal precession
+                 (degrees per year, as from orbit.relativistic_precession;
+                 default is 0)
+
+      toff:      Optional parameter; added to teph to get julian date.
+                 (days, default is 0)
+
+      event:     Optional parameter; 'transit' (default) or 'eclipse'
+
+      errphase:  Optional parameter; error in event phase.
+
+      a:         Optional parameter; semimajor axis (meters).  If given,
+                 eclipse times are delayed by orbit.light_time.
+
+      i:         Optional parameter; inclination (radians), used for the
+                 light-time delay (default pi/2)
+
+OUTPUTS:
+      Returns a tuple (ecl, index), as circorbphase_windows: ecl is the
+      array of event Julian dates and their errors, and index is the
+      index in obswin of the window each event falls in.
+
+NOTES:
+      omega advances linearly with time, period is taken to be the
+      period between transits (sidereal), and the planet moves in
+      mean anomaly with the anomalistic period,
+      period / (1 - omega_dot*period/360).  With omega_dot = 0 (and
+      no light time) the events are the same as those of
+      circorbphase_windows with evphase = orbit.eclipse_phase(omega, e).
+      Errors use the same linear formula as circorbphase.
+
+MODIFICATION HISTORY:
+      Based on circorbphase_windows.
+
+    """
+    obswin = np.asarray(obswin, dtype=np.float64).reshape((-1, 2))
+    if len(obswin) == 0:
+        return np.zeros((2, 0)), np.zeros(0, dtype=int)
+
+    # anomalistic period and time of periastron before teph
+    P      = period[0]
+    wdot   = omega_dot * np.pi / 180. / 365.25   # radians per day
+    Panom  = P / (1 - wdot * P / (2 * np.pi))
+    tperi  = toff + teph[0] - \
+             meananomaly(np.pi/2 - omega*np.pi/180., e) / (2 * np.pi) * Panom
+
+    # every epoch from before the first start to after the last end
+    start  = obswin[:, 0].min()
+    last   = obswin[:, 1].max()
+    n      = np.arange(np.floor((start - toff - teph[0]) / P) - 2,
+                       np.ceil((last - toff - teph[0]) / P) + 2)
+
+    # the event happens at true anomaly fev - omega(t); starting from
+    # the times for a fixed omega, move each time to the mean anomaly
+    # of the event for omega at that time (omega changes so slowly
+    # that a few steps converge).
+    if event == 'eclipse':
+        fev   = 3 * np.pi / 2
+        times = toff + teph[0] + (n + orbit.eclipse_phase(omega, e)) * P
+    else:
+        fev   = np.pi / 2
+        times = toff + teph[0] + n * P
+    for k in range(3):
+        w     = omega + omega_dot * (times - toff - teph[0]) / 365.25
+        dM    = meananomaly(fev - w*np.pi/180., e) - \
+                2 * np.pi * (times - tperi) / Panom
+        times = times + ((dM + np.pi) % (2 * np.pi) - np.pi) / (2 * np.pi) * Panom
+
+    if event == 'eclipse' and a is not None:
+        times = times + orbit.light_time(a, w, e, i) / 86400.
+
+    times, index = cop.windowindex(times, obswin)
+
+    error = np.sqrt((period[1] * (times - (toff + teph[0])) / P)**2\
+                         + teph[1]**2 + (P*errphase)**2)
+
+    return np.array((times, error)), index
+
+def meananomaly(f, e):
+    """
+    Returns the mean anomaly (radians, in (-pi, pi]) at true anomaly
+    f (radians) of an orbit of eccentricity e.
+    """
+    E = 2 * np.arctan(np.tan(f / 2) / ((1 + e) / (1 - e))**0.5)
+    return E - e * np.sin(E)
@@ -0,0 +1,110 @@
+# module contains routines for a precomputed table of eccentricity as
+# a function of eclipse phase and omega (the inverse of
+# orbit.eclipse_phase), stored as a .npy file that is memory-mapped
+# when loaded.
+import os
+import numpy as np
+import orbit
+
+# tables already loaded, by file name
+tables = {}
+
+def build(fname, nphase=2001, nomega=1441):
+    """
+    Computes e on a regular grid of eclipse phase and omega and saves
+    it to the file `fname`.
+
+    Parameters
+    ----------
+    fname : string
+        Name of the table file (.npy).
+    nphase : int
+        Number of grid points in eclipse phase, from 0 to 1.
+    nomega : int
+        Number of grid points in omega, from 0 to 360 degrees.
+
+    Returns
+    -------
+    table : ndarray
+        The [nphase,nomega] table of e.  Grid points where no e gives
+        that eclipse phase and omega are NaN.
+
+    Notes
+    -----
+    The grid is implied by the shape of the table:
+    phase = np.linspace(0, 1, nphase) and
+    omega = np.linspace(0, 360, nomega).  The file is written under a
+    temporary name and then renamed, so other processes never read
+    half a table.  The default grid takes about 30 s to build and 23
+    MB on disk.
+    """
+    phase = np.linspace(0, 1, nphase)[:, np.newaxis]
+    omega = np.linspace(0, 360, nomega)[np.newaxis, :]
+    table, converged = orbit.e_array(phase, omega)
+    table[~converged] = np.nan
+
+    tmp  = '{0}.{1}.tmp'.format(fname, os.getpid())
+    fout = open(tmp, 'wb')
+    np.save(fout, table)
+    fout.close()
+    os.rename(tmp, fname)
+    tables.pop(fname, None)
+    return table
+
+def load(fname):
+    """
+    Returns the table in the file `fname` (see build), memory-mapped
+    read-only, so loading it costs almost nothing and only the parts
+    that are looked up are read from disk.  Each file is opened once
+    per process.
+    """
+    if fname not in tables:
+        tables[fname] = np.load(fname, mmap_mode='r')
+    return tables[fname]
+
+def lookup(table, phase, omega, polish=False):
+    """
+    Looks up e for eclipse phase and omega in a table, with bilinear
+    interpolation.
+
+    Parameters
+    ----------
+    table : ndarray or string
+        A table from build or load, or the name of a table file.
+    phase : scalar or ndarray
+        Phase of secondary eclipse as a fraction of the period.
+    omega : scalar or ndarray
+        Longitude of periastron in degrees.
+    polish : boolean
+        If True, the interpolated values are refined with
+        orbit.e_array, which then takes a few iterations instead of
+        starting from the middle of its bracket.
+
+    Returns
+    -------
+    e : ndarray
+        The eccentricities (same shape as phase and omega broadcast
+        together).  NaN where the table has no e near that phase and
+        omega, or, if polish is set, where there is no solution.
+    """
+    if not isinstance(table, np.ndarray):
+        table = load(table)
+    nphase, nomega = table.shape
+    phase, omega = np.broadcast_arrays(np.asarray(phase, dtype=np.float64),
+                                       np.asarray(omega, dtype=np.float64))
+
+    # grid cell and position within it
+    p  = np.clip(phase, 0, 1) * (nphase - 1)
+    w  = (omega % 360) / 360. * (nomega - 1)
+    i  = np.clip(np.floor(p).astype(int), 0, nphase - 2)
+    j  = np.clip(np.floor(w).astype(int), 0, nomega - 2)
+    fp = p - i
+    fw = w - j
+
+    e = (table[i,   j] * (1 - fp) * (1 - fw) + table[i,   j+1] * (1 - fp) * fw +
+         table[i+1, j] *      fp  * (1 - fw) + table[i+1, j+1] *      fp  * fw)
+
+    if polish:
+        e, converged = orbit.e_array(phase, omega, guess=e)
+        e[~converged] = np.nan
+    return e[()]
@@ -14,6 +14,9 @@ PURPOSE:
       Can also take in hours, minutes, and seconds.
 
 INPUTS:
+      All inputs may be scalars or equal-shaped arrays; with arrays,
+      the Julian date of every element is returned at once.
+
       month:  Number of the month of the year (1 = jan, ...,  12 = dec)
 
       day:    Number of the day of the month.
@@ -34,7 +37,7 @@ INPUTS:
 
 OUTPUTS:
      Julian Day Number (which begins at noon) of the specified calendar date is
-     returned in double precision format.
+     returned in double precision format (an array, for array inputs).
 
 SIDE EFFECTS:
      None.
@@ -52,8 +55,11 @@ MODIFICATION HISTORY:
     '''
     import numpy as np
 
-    # catches a wrong date input
-    if month > 12 or month < 1 or day > 31 or day < 1:
+    month = np.asarray(month)
+    day   = np.asarray(day)
+
+    # catches a wrong date input (any element, for arrays)
+    if np.any((month > 12) | (month < 1) | (day > 31) | (day < 1)):
         raise ValueError, 'Error: Date does not exist. Check the input...'
     
     # Gregorian to Julian conversion formulae; wikipedia
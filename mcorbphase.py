@@ -0,0 +1,125 @@
+import numpy as np
+import circorbphase as cop
+import orbit
+
+def mcorbphase(teph, period, obswin, nsamp=10000, e=None, omega=None, toff=0,
+               evphase=0, corr=None, percent=(2.275, 15.865, 50., 84.135, 97.725),
+               maxmem=256e6, seed=None):
+    """
+NAME:
+      mcorbphase
+
+PURPOSE:
+      Monte Carlo version of circorbphase_windows.  Draws nsamp
+      samples of the time of transit and period (and of e and
+      omega, if given), which may be correlated, computes every
+      event time in the observing windows for every sample, and
+      returns percentiles of the event times.  Unlike the linear
+      error of circorbphase, this accounts for correlations and
+      for the nonlinear dependence of the eclipse phase on e and
+      omega.
+
+INPUTS:
+      teph:     Time of transit and error; 2-element array (Julian day)
+
+      period:   Period of planet and error; 2-element array (days)
+
+      obswin:   [nwin,2] array of Julian dates for the start and end
+                of each observing window.  Windows must not overlap.
+
+      nsamp:    Optional parameter; number of samples (default 10000)
+
+      e:        Optional parameter; eccentricity and error; 2-element
+                array.  If e and omega are given, the event is the
+                secondary eclipse, and its phase is computed for each
+                sample with orbit.eclipse_phase (evphase is ignored).
+                Samples are clipped to 0 <= e < 1.
+
+      omega:    Optional parameter; longitude of periastron and error;
+                2-element array (degrees)
+
+      toff:     Optional parameter; added to teph to get julian date.
+                (days, default is 0)
+
+      evphase:  Optional parameter; phase of event to calculate
+                (default 0 - primary eclipse)
+
+      corr:     Optional parameter; correlation matrix of (teph, period)
+                or, if e and omega are given, of (teph, period, e,
+                omega).  Default is no correlation.
+
+      percent:  Optional parameter; percentiles of the event times to
+                return (default is the median and 1 and 2 sigma)
+
+      maxmem:   Optional parameter; approximate maximum memory, in
+                bytes, used for the [nsamp,nevents] arrays of event
+                times.  Events are processed in chunks to stay below
+                it (default 256e6).
+
+      seed:     Optional parameter; seed for the random numbers.
+
+OUTPUTS:
+      Returns a tuple (ecl, pct, index).  ecl is the array of nominal
+      event Julian dates and the standard deviations of the samples
+      (like circorbphase), pct is the [len(percent),nevents] array of
+      percentiles, and index is the index in obswin of the window each
+      event falls in (as in circorbphase_windows).
+
+EXAMPLE/TEST:
+
+import numpy as np
+import julday as jd
+import mcorbphase as mcop
+teph   = np.array([2454746.28890, 0.0007])
+period = np.array([2.2437563, 0.000009])
+obswin = np.array([\
+[jd.julday(2,17,2009,17,57,0), jd.julday(4, 6, 2009, 20, 23, 0)],\
+[jd.julday(7,22,2009, 5,55,0), jd.julday(9, 10, 2009, 1, 7,  0)]])
+ecl, pct, index = mcop.mcorbphase(teph, period, obswin, 100000,
+                     e=[0.087, 0.002], omega=[-1.6, 1.2], seed=1)
+
+MODIFICATION HISTORY:
+      Based on circorbphase_windows.
+
+    """
+    teph   = np.asarray(teph,   dtype=np.float64)
+    period = np.asarray(period, dtype=np.float64)
+    ecc    = e is not None and omega is not None
+
+    # nominal event phase and events; n is the epoch of each event
+    if ecc:
+        params  = np.array((teph, period, e, omega), dtype=np.float64)
+        evphase = orbit.eclipse_phase(params[3, 0], params[2, 0])
+    else:
+        params  = np.array((teph, period), dtype=np.float64)
+    ephase = evphase % 1
+    ecl, index = cop.circorbphase_windows(teph, period, obswin, toff, ephase)
+    n = np.round((ecl[0] - toff - teph[0]) / period[0] - ephase)
+
+    # correlated samples of the parameters
+    if corr is None:
+        corr = np.identity(len(params))
+    cov     = np.asarray(corr) * np.outer(params[:, 1], params[:, 1])
+    rand    = np.random.RandomState(seed)
+    samples = rand.multivariate_normal(params[:, 0], cov, nsamp)
+    tsamp   = toff + samples[:, 0:1]
+    psamp   = samples[:, 1:2]
+    if ecc:
+        esamp = np.clip(samples[:, 2], 0, 1 - 1e-9)
+        # keep the sampled phase next to the nominal one
+        dphase = (orbit.eclipse_phase(samples[:, 3], esamp) - ephase + 0.5) % 1 - 0.5
+        phsamp = (ephase + dphase)[:, np.newaxis]
+    else:
+        phsamp = ephase
+
+    # event times, a chunk of events at a time
+    nev   = len(n)
+    chunk = max(1, int(maxmem // (3 * 8 * nsamp)))
+    std   = np.zeros(nev)
+    pct   = np.zeros((len(percent), nev))
+    for i in range(0, nev, chunk):
+        times = tsamp + (n[i:i+chunk] + phsamp) * psamp
+        std[i:i+chunk]    = times.std(axis=0)
+        pct[:, i:i+chunk] = np.percentile(times, percent, axis=0)
+
+    return np.array((ecl[0], std)), pct, index
@@ -5,6 +5,9 @@
 #A set of functions for calculating, constraining, and updating orbital parameters
 #affecting the timing of the secondary eclipse.
 import math
+import inspect
+import functools
+import collections
 import numpy as np
 #import models
 import scipy.optimize
@@ -13,6 +16,8 @@ G = 6.674e-11
 msun = 1.98892e30
 rsun = 6.955e8
 rjupiter = 71492000
+mjupiter = 1.8986e27
+c = 299792458
 
 '''orbit.py contains functions for predicting and deriving parameters of the transit
 and secondary eclipse related to the planet's orbit.  
@@ -22,26 +27,37 @@ Contents:
 	-light_time()		calculates light-time correction
 	-secondary_eclipse()	reports all known secondary eclipse parameters and errors
 	-duration()		calculates transit/eclipse duration
+	-duration_array()	same as duration(), for arrays
 	-error_duration()	computes transit duration with error estimate
 	-limb_time()		computes transit/eclipse limb crossing time
-	-ephemeris()		prints a list of eclipse dates
+	-ephemeris()		computes a list of eclipse dates (for one or many planets)
 	inclination()		calculates inclination given trnasit and orbital parameters
 	-eclipse_phase()	computes phase of secondary eclipse
 	-error_eclipse()	computes error assocated with phase of secondary eclipse
+	-eclipse_phase_de()	derivative of eclipse_phase() with respect to e
 +Solution Functions
-	-e_duration()		solves for eccentricity given eclipse phase and transit duration 
+	-e_duration()		solves for eccentricity (and omega) given eclipse phase and transit duration 
+	-duration_residual()	duration residual used by e_duration()
+	-e_duration_bisect()	refines brackets of e_duration() solutions
 	-error_e_duration()	same as e_duration, but with errors
 	-e_transit()		solves for eccentricity given the ratio between observed and expected transit durations
 	-e_transit_eclipse()	solves for eccentricity	
 	-ecosomega()		solves for minimum eccentricity, or e*cosine(omega)
 	-error_ecosomega()	computes error assocaed with above function
+	-fit_ephemeris()	fits ttrans and period to measured transit times
 	-observed_phase_error()	adds effects of ephemeris drift to known eclipse error
 	-e()			computes eccentricity given omega and phase of secondary eclipse
+	-e_array()		same as e(), for arrays of phase and omega
 +Miscellaneous Functions
 	-radial_velocity()	computes single-planet radial velocity
-	-true_anomaly()		computes true anomaly using Newton's method
+	-kepler()		solves Kepler's equation for arrays of mean anomaly
+	-true_anomaly()		computes true anomaly using kepler()
+	-jacobian()		computes a Jacobian with a single call of a function
+	-propagate()		propagates uncertainties through a function
 	-relativistic_precession()	predicts effect of relativitistic precession
 	-GR_eclipse()		predicts change in phase of secondary eclipse given precession
+	-rwprecession()		predicts tidal precession period
+	-precession_drift()	projects the eclipse-time drift from GR and tidal precession
 +Defunct Functions and Notes
 	-area()
 	-phase()
@@ -49,7 +65,91 @@ Contents:
 	-omega()
 	-chi_square()
 	-e_omega_fit()
++Memoization
+	-enable_cache()		caches eclipse_phase() and duration() for scalar arguments
+	-disable_cache()	turns the cache off and empties it
+	-cache_info()		reports cache hits, misses and size
 '''
+#Memoization
+
+#None while the cache is off, else an OrderedDict in least-recently-used order
+cache = None
+cache_settings = {'maxsize': 1024, 'digits': 15}
+cache_stats = {'hits': 0, 'misses': 0}
+#argument types that are cached (checking these is much faster than numbers.Number)
+cache_scalars = (float, int, np.number)
+
+def enable_cache(maxsize=1024, digits=15):
+	'''Turns on the cache of eclipse_phase() and duration().  Calls with only scalar 
+		arguments are looked up by their arguments rounded to digits significant 
+		digits; the least recently used result is dropped past maxsize entries.
+		Fewer digits give more hits, but the solvers (e.g. e()) then lose precision.
+		maxsize	=	maximum number of cached results
+		digits	=	significant digits of the float arguments in the key'''
+	global cache
+	if cache is None:
+		cache = collections.OrderedDict()
+	cache_settings['maxsize'] = maxsize
+	cache_settings['digits'] = digits
+	while len(cache) > maxsize:
+		cache.popitem(last=False)
+
+def disable_cache():
+	'''Turns off the cache and empties it, and resets its counters.'''
+	global cache
+	cache = None
+	cache_stats['hits'] = 0
+	cache_stats['misses'] = 0
+
+def cache_info():
+	'''Returns a dictionary with the hits, misses, size and maxsize of the cache.'''
+	info = dict(cache_stats)
+	info['size'] = 0 if cache is None else len(cache)
+	info['maxsize'] = cache_settings['maxsize']
+	return info
+
+def cache_round(value):
+	'''Rounds a float to the significant digits of the cache keys.'''
+	if isinstance(value, float):
+		return float('%.*g' % (cache_settings['digits'], value))
+	return value
+
+def memoize(func):
+	'''Decorator that uses the cache for func when it is on and every argument is a 
+		scalar.'''
+	argnames, varargs, keywords, defaults = inspect.getargspec(func)
+	defaults = dict(zip(argnames[len(argnames)-len(defaults or ()):], defaults or ()))
+	@functools.wraps(func)
+	def wrapper(*args, **kwargs):
+		if cache is None:
+			return func(*args, **kwargs)
+		#bind the arguments to the signature, so that a call has the same key whether
+		#its arguments are passed by position, by keyword, or left to their defaults
+		unbound = dict(kwargs)
+		try:
+			bound = args + tuple(unbound.pop(name) if name in unbound else defaults[name]
+					for name in argnames[len(args):])
+		except KeyError:
+			bound = None
+		if bound is None or unbound or len(bound) != len(argnames):
+			#missing, unknown or repeated arguments: func raises the TypeError
+			return func(*args, **kwargs)
+		if not all(isinstance(value, cache_scalars) for value in bound):
+			#arrays are not cached
+			return func(*bound)
+		key = (func.__name__,) + tuple(cache_round(value) for value in bound)
+		if key in cache:
+			cache_stats['hits'] += 1
+			value = cache.pop(key)
+		else:
+			cache_stats['misses'] += 1
+			value = func(*bound)
+			if len(cache) >= cache_settings['maxsize']:
+				cache.popitem(last=False)
+		cache[key] = value
+		return value
+	return wrapper
+
 #Prediction Functions
 
 def light_time(a, omega, e, i=np.pi/2, secondary_primary=True):
@@ -125,6 +225,7 @@ def secondary_eclipse(params, b=(0, 0), i=(np.pi/2, 0)):
 	print "esin(omega) Upper Limit:",  ((1-(r_planet/r_star))/b-1)/((1-(r_planet/r_star))/b+1)
 	
 
+@memoize
 def duration(e, period, omega, m_star, r_star, r_planet, i=np.pi/2, primary = True, b=0):
 	'''Computes the duration of transit and secondary eclipse in minutes.
 		Equations from Tingley and Sackett 2005.
@@ -138,57 +239,58 @@ def duration(e, period, omega, m_star, r_star, r_planet, i=np.pi/2, primary = Tr
 		primary	=	will return the duration of the primary transit if true
 				and the duration of secondary eclipse if false
 		b	=	impact parameter - entered if i is not known'''
+	d = duration_array(e, period, omega, m_star, r_star, r_planet, i, primary, b)
+	if np.isnan(d):
+		print "Occultation Impossible:  Inclination too low."
+		return 0
+	return d
+
+def duration_array(e, period, omega, m_star, r_star, r_planet, i=np.pi/2, primary = True, b=0):
+	'''Same as duration(), but every argument except primary may be an array
+		(they are broadcast together).  Returns NaN instead of printing a
+		message where the occultation is impossible.'''
 	if primary == True:	
-		theta = np.pi*(90-omega)/180.0
+		theta = np.pi*(90-np.asarray(omega))/180.0
 	else:
-		theta = np.pi*(90+omega)/180.0
+		theta = np.pi*(90+np.asarray(omega))/180.0
 	#i = np.pi*i/180
-	m_star *= msun
+	m_star = m_star*msun
 	#r_star *= 6.955e8
 	#r_planet *= 71492000
-	period *= 86400
+	period = period*86400
 	G = 6.673e-11
 	a = (G*m_star*(period/(2*np.pi))**2)**(1/3.0)
 	r = a*(1-e**2)/(1+e*np.cos(theta))
 	d = 2*(r_star+r_planet)*(1-e**2)**0.5
-	d *= 1/(1 + e*np.cos(theta))
-	d *= (period/(2*np.pi*G*m_star))**(1/3.0)
-	if np.cos(i)*r/r_star > (r_planet+r_star)/r_star or b > (r_planet+r_star)/r_star:
-		print "Occultation Impossible:  Inclination too low."
-		return 0
-	elif b == 0:
-		#d *= ((1+(r_planet/r_star))**2-(np.cos(i)*r/r_star)**2)**0.5
-		d *= (1- ((r*np.cos(i))/(r_planet+r_star))**2)**0.5
-		return d/60
-	elif b != 0:
-		#d *= ((1+(r_planet/r_star))**2-b**2)**0.5
-		d *= (1- ((b*r_star)/(r_planet+r_star))**2)**0.5
-		return d/60
+	d = d/(1 + e*np.cos(theta))
+	d = d*(period/(2*np.pi*G*m_star))**(1/3.0)
+	impossible = (np.cos(i)*r > r_planet+r_star) | (b*r_star > r_planet+r_star)
+	#impact distance from i if b is not given
+	z = np.where(np.equal(b, 0), r*np.cos(i), b*r_star)
+	with np.errstate(invalid='ignore'):
+		d = d*(1 - (z/(r_planet+r_star))**2)**0.5
+	return np.where(impossible, np.nan, d)[()]/60
 
 def error_duration(e, period, omega, m_star, r_star, r_planet, i=np.pi/2, primary = True, 
 	b=0, sigma_e=0, sigma_p=0, sigma_o=0, sigma_ms=0, sigma_rs=0, sigma_rp=0, sigma_i=0, sigma_b=0):
 	'''Returns the error associated with the function duration.  Inputs are the same, except
-		with errors.
+		with errors.  The errors are propagated with propagate().
 		sigma_e	=	uncertainty associated with eccentricity (e)
 		sigma_o		=	uncertainty associated with longitude of periastron (omega)
 		sigma_p		=	uncertainty associated with period (period)
 		sigma_ms	=	uncertainty associated with stellar mass (m_star)
 		sigma_rs	=	uncertainty associated with stellar radius (r_star)
-		sigma_rp	=	uncertainty associated with planet mass (r_planet)
+		sigma_rp	=	uncertainty associated with planet radius (r_planet)
 		sigma_i		=	uncertainty associated with inclination (i)
 		sigma_b		=	uncertainty associated with impact paramter (b)'''
-	h = 1e-8
-	sigma = sigma_e**2*((duration(e+h, period, omega, m_star, r_star, r_planet, i, primary, b)-duration(e-h, period, omega, m_star, r_star, r_planet, i, primary, b))/(2*h))**2
-	sigma+= sigma_p**2*((duration(e, period+h, omega, m_star, r_star, r_planet, i, primary, b)-duration(e, period-h, omega, m_star, r_star, r_planet, i, primary, b))/(2*h))**2
-	sigma+= sigma_o**2*((duration(e, period, omega+h, m_star, r_star, r_planet, i, primary, b)-duration(e, period, omega-h, m_star, r_star, r_planet, i, primary, b))/(2*h))**2
-	sigma+= sigma_ms**2*((duration(e, period, omega, m_star+h, r_star, r_planet, i, primary, b)-duration(e, period, omega, m_star-h, r_star, r_planet, i, primary, b))/(2*h))**2	
-	sigma+= sigma_rs**2*((duration(e, period, omega, m_star, r_star*(1+h), r_planet, i, primary, b)-duration(e, period, omega, m_star, r_star*(1-h), r_planet, i, primary, b))/(2*h*r_star))**2	
-	sigma+= sigma_p**2*((duration(e, period, omega, m_star+h, r_star*(1+h), r_planet+h, i, primary, b)-duration(e, period, omega, m_star, r_star*(1-h), r_planet-h, i, primary, b))/(2*h*r_planet))**2	
-	sigma+= sigma_p**2*((duration(e, period, omega, m_star+h, r_star, r_planet, i, primary, b)-duration(e, period, omega, m_star-h, r_star, r_planet, i, primary, b))/(2*h))**2	
-	sigma+= sigma_i**2*((duration(e, period, omega, m_star+h, r_star, r_planet, i+h, primary, b)-duration(e, period, omega, m_star-h, r_star, r_planet, i-h, primary, b))/(2*h))**2	
-	sigma+= sigma_b**2*((duration(e, period, omega, m_star+h, r_star, r_planet, i, primary, b+h)-duration(e, period, omega, m_star-h, r_star, r_planet, i, primary, b-h))/(2*h))**2	
-	
-	return duration(e, period, omega, m_star+h, r_star, r_planet, i, primary, b), sigma**0.5
+	def func(e, period, omega, m_star, r_star, r_planet, i, b):
+		return duration_array(e, period, omega, m_star, r_star, r_planet, i, primary, b)
+	#b = 0 means i is used instead, so b is not perturbed then
+	if b == 0:
+		sigma_b = 0
+	d, sigma = propagate(func, (e, period, omega, m_star, r_star, r_planet, i, b),
+		(sigma_e, sigma_p, sigma_o, sigma_ms, sigma_rs, sigma_rp, sigma_i, sigma_b))[:2]
+	return d[0], sigma[0]
 
 def limbtime(b, duration, r_star, r_planet, sigma_b=0, sigma_d=0, sigma_rs=0, sigma_rp=0):
 	try:
@@ -205,18 +307,20 @@ def limbtime(b, duration, r_star, r_planet, sigma_b=0, sigma_d=0, sigma_rs=0, si
 		return 0, 0
 
 def ephemeris(period, current_JD, epoch, n_predictions, eclipse_phase):
-	'''Computes a list of secondary eclipse transit dates.
+	'''Computes a list of secondary eclipse transit dates.  period, current_JD, epoch 
+		and eclipse_phase may be arrays (one element per planet); the result then has 
+		one row of n_predictions dates per planet.
 		period		 =	period of orbit (days)
 		current_JD	 =	current Julian Date
 		epoch 		 =	Julian Date of Transit
 		n_predictions	 = 	Number of predictions in the returned list
 		eclipse_phase 	 =	Phase of secondary eclipse'''
-	dates = np.zeros(n_predictions)
-	while current_JD > epoch:
-        	epoch+=period
-	for n in range(0, n_predictions):
-	        dates[n] = epoch+(eclipse_phase*period)+n*period
-	return dates
+	period, current_JD, epoch, eclipse_phase = [np.asarray(x, dtype=np.float64)[...,np.newaxis] 
+		for x in (period, current_JD, epoch, eclipse_phase)]
+	#number of the first transit at or after current_JD
+	k = np.maximum(np.ceil((current_JD - epoch)/period), 0)
+	n = np.arange(n_predictions)
+	return epoch + (k + n + eclipse_phase)*period
 
 def inclination(e, omega, b, period, r_star, m_star, errors=np.zeros((6))):
 	'''Calculates inclination.  Error calculations forthcoming.
@@ -260,6 +364,7 @@ def scaled_eclipse(e, omega, duration, rp_rs, b):
 	return d_secondary, b_secondary, limb[0], phase
 		
 
+@memoize
 def eclipse_phase(omega, e):
 	'''Predicts phase of secondary eclipse given longitude of periastron
 		and eccentricity.  Unlike phase(), this method uses Kepler's
@@ -278,16 +383,30 @@ def eclipse_phase(omega, e):
 
 def error_eclipse(e, e_error, omega, omega_error):
 	'''Computes the error associated with the function eclipse_phase().
-		Numerical differentiation is used to approximate the partial derivative
-		of eclipse_phase().
-		e	=	eccentricity(eclipse)/(period) % period
+		The partial derivatives are computed numerically by propagate().
+		e	=	eccentricity
 		e_error	=	uncertainty associated with eccentricity
 		omega	=	longitude of periastron
 		omega_error	uncertainty associated with omega'''
-	h = 1e-8
-	sigma = e_error**2*((eclipse_phase(omega, e+h)-eclipse_phase(omega, e))/h)**2
-	sigma += omega_error**2*((eclipse_phase(omega+h, e)-eclipse_phase(omega, e))/h)**2
-	return sigma**0.5
+	def func(e, omega):
+		return eclipse_phase(omega, e)
+	return propagate(func, (e, omega), (e_error, omega_error))[1][0]
+
+def eclipse_phase_de(omega, e):
+	'''Partial derivative of eclipse_phase() with respect to e, used by
+		the Newton steps of e_array().  Works on arrays.
+		omega	=	longitude of periastron in degrees
+		e	=	eccentricity'''
+	omega = omega*np.pi/180.0
+	a = ((1+e)/(1-e))**0.5
+	da = 1/((1-e)**2*a)
+	deriv = 0
+	for sign, f in ((1, 3*np.pi/2 - omega), (-1, np.pi/2 - omega)):
+		t = np.tan(f/2)
+		E = 2*np.arctan(t/a)
+		dE = -2*t/(a**2 + t**2)*da
+		deriv = deriv + sign*(dE*(1 - e*np.cos(E)) - np.sin(E))
+	return deriv/(2*np.pi)
 
 def mandel_geom(params, x):
 	midpt, width, rp_rs, b, flux = params
@@ -318,45 +437,84 @@ def mandelecl_orbit(params, x):
 
 #Solution Functions
 
-def e_duration(eclipse_phase, width, period, m_star, r_star, r_planet, i=np.pi/2, primary = True, b=0):
+def e_duration(eclipse_phase, width, period, m_star, r_star, r_planet, i=np.pi/2, primary = True, b=0,
+	allroots=False, n=720, tol=1e-10):
 	'''Solves for e and omega using the observed phase of secondary eclipse and 
 		the measured duration of either the transit or secondary eclipse.
+		The duration residual is evaluated on a grid of n values of omega
+		all at once, and only the grid cells where it changes sign are
+		refined (by bisection, to tol degrees), so every solution is found.
 
 		eclipse_phase	=	phase of secondary eclipse
 		width		=	transit/eclipse duration in minutes
 		period		=	orbital period in days
 		m_star		=	mass of star in solar masses
-		r_star		=	radius of star in solar radii
-		r_planet	=	radius of planet in jovian radii
+		r_star		=	radius of star in meters
+		r_planet	=	radius of planet in meters
 		i		=	inclination in radians
 		primary		=	Boolean.  True for transit and False for eclipse
-		b		=	impact parameter'''
+		b		=	impact parameter
+		allroots	=	Boolean.  If True, returns arrays with every
+					solution (sorted by omega) instead of the first
+		n		=	number of grid points in omega
+		tol		=	convergence tolerance in omega (degrees)'''
+	#bracket every sign change on the grid (0 and 360 are the same point)
+	grid = np.linspace(0, 360, n+1)
+	res = duration_residual(grid, eclipse_phase, width, period, m_star, r_star, r_planet, i, primary, b)
+	with np.errstate(invalid='ignore'):
+		k = np.where((res[:-1]*res[1:] < 0) | (res[:-1] == 0))[0]
+	#refine all brackets together
+	omega = e_duration_bisect(grid[k], grid[k+1], eclipse_phase, width, period, m_star,
+		r_star, r_planet, i, primary, b, tol)
+	omega = np.unique(omega % 360)
+	#drop brackets that straddled a jump instead of a root
+	ecc = e_array(eclipse_phase, omega)[0]
+	res = duration_residual(omega, eclipse_phase, width, period, m_star, r_star, r_planet, i, primary, b)
+	with np.errstate(invalid='ignore'):
+		good = np.abs(res) < 1e-6*width
+	if allroots:
+		return ecc[good], omega[good]
+	if not np.any(good):
+		print "Convergence failure."
+		return np.nan, np.nan
+	return ecc[good][0], omega[good][0]
 	
-	left = -360.0
-        right = 360.0
-	h = 1e-8
-	x = 0
-        while abs(left-right) > 1e-14:
+def duration_residual(omega, eclipse_phase, width, period, m_star, r_star, r_planet, i=np.pi/2, 
+	primary = True, b=0):
+	'''Difference between the duration predicted for omega (and the e that gives eclipse_phase
+		at that omega) and the measured width, in minutes.  All arguments except primary may 
+		be arrays.  NaN where there is no such e or the occultation is impossible.'''
+	ecc, conv = e_array(eclipse_phase, omega)
+	res = duration_array(ecc, period, omega, m_star, r_star, r_planet, i, primary, b) - width
+	return np.where(conv, res, np.nan)
+
+def e_duration_bisect(left, right, eclipse_phase, width, period, m_star, r_star, r_planet, i=np.pi/2, 
+	primary = True, b=0, tol=1e-10):
+	'''Refines brackets [left, right] in omega (degrees) around solutions of e_duration() by
+		bisection, for arrays of brackets (and parameters) all at once.  Returns omega.'''
+	args = (eclipse_phase, width, period, m_star, r_star, r_planet, i, primary, b)
+	zeros = np.zeros(np.broadcast(left, right, eclipse_phase, width, period, m_star, r_star, 
+		r_planet, i, b).shape)
+	left, right = left+zeros, right+zeros
+	fleft = duration_residual(left, *args)
+	for n in range(200):
 		midpoint = (left+right)/2
-		test = (duration(e(eclipse_phase, left), period, left, m_star, r_star, r_planet, i, primary, b)-width)
-		test*= (duration(e(eclipse_phase, midpoint), period, midpoint, m_star, r_star, r_planet, i, primary, b)-width)
-		if test >= 0:
-			left = midpoint
-		else:
-			right = midpoint
-		#print midpoint
-		x+=1
-		if x > 256:
-			print "Convergence failure."
+		if left.size == 0 or np.all((right-left <= tol) | (midpoint == left) | (midpoint == right)):
 			break
-	#sigma = error_e_duration(eclipse_phase, width, period, m_star, r_star, r_planet, i, primary, b,
-	#	 sigma_phi, sigma_d, sigma_p, sigma_ms, sigma_rs, sigma_rp, sigma_i, sigma_b)
-	return e(eclipse_phase, midpoint), midpoint % 360
-	
+		fmid = duration_residual(midpoint, *args)
+		with np.errstate(invalid='ignore'):
+			same = fleft*fmid > 0
+		left = np.where(same, midpoint, left)
+		fleft = np.where(same, fmid, fleft)
+		right = np.where(same, right, midpoint)
+	return (left+right)/2
+
 def error_e_duration(eclipse_phase, width, period, m_star, r_star, r_planet, i=np.pi/2, primary = True, 
 	b=0, sigma_phi=0, sigma_d=0, sigma_p=0, sigma_ms=0, sigma_rs=0, sigma_rp=0, sigma_i=0, sigma_b=0):
 	'''Uses e_duration() and known uncertainties to return e and omega with new respective uncertainties.
-		Because of the heavy use of numerical methods, this function may take up to 20 seconds to run.
+		The perturbed solutions needed by propagate() are all found together by bisection 
+		within 0.5 degrees of the nominal omega; the uncertainties are NaN if a perturbed 
+		solution leaves that bracket.
 		
 		eclipse_phase	=	phase of secondary eclipse
 		width		=	transit/eclipse duration in minutes
@@ -364,7 +522,7 @@ def error_e_duration(eclipse_phase, width, period, m_star, r_star, r_planet, i=n
 		m_star		=	mass of star in solar masses
 		r_star		=	radius of star in meters
 		r_planet	=	radius of planet in meters
-		i		=	inclination in degrees
+		i		=	inclination in radians
 		primary		=	Boolean.  True for transit and False for eclipse
 		b		=	impact parameter
 		sigma_phi	=	uncertainty associated with eclipse phase (eclipse_phase)
@@ -372,30 +530,29 @@ def error_e_duration(eclipse_phase, width, period, m_star, r_star, r_planet, i=n
 		sigma_p		=	uncertainty associated with period (period)
 		sigma_ms	=	uncertainty associated with stellar mass (m_star)
 		sigma_rs	=	uncertainty associated with stellar radius (r_star)
-		sigma_rp	=	uncertainty associated with planet mass (r_planet)
+		sigma_rp	=	uncertainty associated with planet radius (r_planet)
 		sigma_i		=	uncertainty associated with inclination (i)
 		sigma_b		=	uncertainty associated with impact paramter (b)
 		'''	
-	h = 1e-8
-	sigma_e = sigma_phi**2*((e_duration(eclipse_phase+h, width, period, m_star, r_star, r_planet, i, primary, b)[0]-e_duration(eclipse_phase-h, width, period, m_star, r_star, r_planet, i, primary, b)[0])/(2*h))**2	
-	sigma_e += sigma_d**2*((e_duration(eclipse_phase, width+h, period, m_star, r_star, r_planet, i, primary, b)[0]-e_duration(eclipse_phase, width-h, period, m_star, r_star, r_planet, i, primary, b)[0])/(2*h))**2	
-	sigma_e += sigma_p**2*((e_duration(eclipse_phase, width, period+h, m_star, r_star, r_planet, i, primary, b)[0]-e_duration(eclipse_phase, width, period-h, m_star, r_star, r_planet, i, primary, b)[0])/(2*h))**2	
-	sigma_e += sigma_ms**2*((e_duration(eclipse_phase, width, period, m_star+h, r_star, r_planet, i, primary, b)[0]-e_duration(eclipse_phase, width, period, m_star-h, r_star, r_planet, i, primary, b)[0])/(2*h))**2	
-	sigma_e += sigma_rs**2*((e_duration(eclipse_phase, width, period, m_star, r_star*(1+h), r_planet, i, primary, b)[0]-e_duration(eclipse_phase, width, period, m_star, r_star*(1-h), r_planet, i, primary, b)[0])/(2*h*r_star))**2	
-	sigma_e += sigma_rp**2*((e_duration(eclipse_phase, width, period, m_star, r_star, r_planet*(1+h), i, primary, b)[0]-e_duration(eclipse_phase, width, period, m_star, r_star, r_planet*(1-h), i, primary, b)[0])/(2*h*r_planet))**2	
-	sigma_e += sigma_i**2*((e_duration(eclipse_phase, width, period, m_star, r_star, r_planet, i+h, primary, b)[0]-e_duration(eclipse_phase, width, period, m_star, r_star, r_planet, i-h, primary, b)[0])/(2*h))**2	
-	sigma_e += sigma_b**2*((e_duration(eclipse_phase, width, period, m_star, r_star, r_planet, i, primary, b+h)[0]-e_duration(eclipse_phase, width, period, m_star, r_star, r_planet, i, primary, b-h)[0])/(2*h))**2	
-	
-	sigma_o = sigma_phi**2*((e_duration(eclipse_phase+h, width, period, m_star, r_star, r_planet, i, primary, b)[1]-e_duration(eclipse_phase-h, width, period, m_star, r_star, r_planet, i, primary, b)[1])/(2*h))**2	
-	sigma_o += sigma_d**2*((e_duration(eclipse_phase, width+h, period, m_star, r_star, r_planet, i, primary, b)[1]-e_duration(eclipse_phase, width-h, period, m_star, r_star, r_planet, i, primary, b)[1])/(2*h))**2	
-	sigma_o += sigma_p**2*((e_duration(eclipse_phase, width, period+h, m_star, r_star, r_planet, i, primary, b)[1]-e_duration(eclipse_phase, width, period-h, m_star, r_star, r_planet, i, primary, b)[1])/(2*h))**2	
-	sigma_o += sigma_ms**2*((e_duration(eclipse_phase, width, period, m_star+h, r_star, r_planet, i, primary, b)[1]-e_duration(eclipse_phase, width, period, m_star-h, r_star, r_planet, i, primary, b)[1])/(2*h))**2	
-	sigma_o += sigma_rs**2*((e_duration(eclipse_phase, width, period, m_star, r_star*(1+h), r_planet, i, primary, b)[1]-e_duration(eclipse_phase, width, period, m_star, r_star*(1-h), r_planet, i, primary, b)[1])/(2*h*r_star))**2	
-	sigma_o += sigma_rp**2*((e_duration(eclipse_phase, width, period, m_star, r_star, r_planet*(1+h), i, primary, b)[1]-e_duration(eclipse_phase, width, period, m_star, r_star, r_planet*(1-h), i, primary, b)[1])/(2*h*r_planet))**2	
-	sigma_o += sigma_i**2*((e_duration(eclipse_phase, width, period, m_star, r_star, r_planet, i+h, primary, b)[1]-e_duration(eclipse_phase, width, period, m_star, r_star, r_planet, i-h, primary, b)[1])/(2*h))**2	
-	sigma_o += sigma_b**2*((e_duration(eclipse_phase, width, period, m_star, r_star, r_planet, i, primary, b+h)[1]-e_duration(eclipse_phase, width, period, m_star, r_star, r_planet, i, primary, b-h)[1])/(2*h))**2	
-	
-	return e_duration(eclipse_phase, width, period, m_star, r_star, r_planet, i, primary, b)[0], sigma_e**0.5, e_duration(eclipse_phase, width, period, m_star, r_star, r_planet, i, primary, b)[1], sigma_o**0.5
+	e0, omega0 = e_duration(eclipse_phase, width, period, m_star, r_star, r_planet, i, primary, b)
+	if np.isnan(omega0):
+		return e0, np.nan, omega0, np.nan
+	def func(eclipse_phase, width, period, m_star, r_star, r_planet, i, b):
+		args = (eclipse_phase, width, period, m_star, r_star, r_planet, i, primary, b)
+		left, right = omega0-0.5, omega0+0.5
+		#the solution must stay alone in the bracket; NaN if the residual does not change sign
+		with np.errstate(invalid='ignore'):
+			bracketed = duration_residual(left, *args)*duration_residual(right, *args) < 0
+		omega = e_duration_bisect(left, right, *args, tol=0)
+		omega = np.where(bracketed, omega, omega0)
+		return np.where(bracketed, e_array(eclipse_phase, omega)[0], np.nan), \
+			np.where(bracketed, omega, np.nan)
+	#b = 0 means i is used instead, so b is not perturbed then
+	if b == 0:
+		sigma_b = 0
+	sigma = propagate(func, (eclipse_phase, width, period, m_star, r_star, r_planet, i, b),
+		(sigma_phi, sigma_d, sigma_p, sigma_ms, sigma_rs, sigma_rp, sigma_i, sigma_b), h=1e-6)[1]
+	return e0, sigma[0], omega0, sigma[1]
 
 def e_transit(omega, d_ratio):
 	'''Solves for eccentricity given a value of omega and the ratio of the observed 
@@ -444,31 +601,49 @@ def e_transit_eclipse(eclipse_phase, d_ratio):
 
 
 
-def ecosomega(phase, emin=True):        
+def ecosomega(phase, emin=True, tol=1e-12, maxiter=50):        
 	'''
 	Uses the observed phase of secondary eclipse to compute a minimum value of eccentricity,
 	equal to e*cos(omega) when omega = 0.  This function first generates an estimate of this quantity and
-	uses the secant method to refine this value.  
+	uses the secant method to refine this value.  phase may be an array; all elements are iterated
+	together, and the ones that do not converge (or leave -1 < e*cos(omega) < 1) are NaN.
 	
 	A negative output indicates that omega is between 90 and 270 degrees while a positive output
 	indicates that omega is between 270 and 90 degrees.
 	'''
-	
-        x = np.zeros(50)
-       	x[0] = np.pi/2*(phase-0.5)
-       	x[1] = np.pi/2*(phase-0.5)-1e-8
-       	for i in range(2, 49):
-       		x[i+1] = x[i] - (eclipse_phase(0, x[i])-phase)*(x[i]-x[i-1])/((eclipse_phase(0, x[i])-phase)-(eclipse_phase(0, x[i-1]) - phase))
-            	if round(x[i], 12) ==round(x[i-1], 12) or x[i] =='nan' or x[i] == 'inf' or x[i] == 1:
-			if emin == True:
-                		return np.abs(x[i-1])
-			else:
-				return x[i-1]
+	phase = np.asarray(phase, dtype=np.float64)
+	def residual(k, x):
+		# phase difference, wrapped to [-0.5, 0.5)
+		return (eclipse_phase(0, x) - phase.flat[k] + 0.5) % 1 - 0.5
 
+	x1 = np.pi/2*(phase.ravel()-0.5)
+	x0 = x1 - 1e-8
+	result = np.zeros(x1.shape) + np.nan
+	k = np.arange(x1.size)
+	f0 = residual(k, x0)
+	for i in range(maxiter):
+		if k.size == 0:
+			break
+		f1 = residual(k, x1)
+		with np.errstate(divide='ignore', invalid='ignore'):
+			x2 = x1 - f1*(x1-x0)/(f1-f0)
+			#converged, or failed (the secant method left -1 < x < 1)
+			stop = (np.abs(x2-x1) < tol) | (f1 == 0)
+			fail = ~stop & ~(np.abs(x2) < 1)
+		result[k[stop]] = np.where(f1[stop] == 0, x1[stop], x2[stop])
+		stop |= fail
+		x0, f0, x1 = x1[~stop], f1[~stop], x2[~stop]
+		k = k[~stop]
+	with np.errstate(invalid='ignore'):
+		result[~(np.abs(result) < 1)] = np.nan
+	if emin == True:
+		result = np.abs(result)
+	return result.reshape(phase.shape)[()]
 
 def error_ecosomega(transit, eclipse, period, transit_error=0, eclipse_error=0, period_error=0, emin=True):
 	'''Computes the error associated with the function ecosomega().
-		Returns a tuple containing the minimum eccentricity and the error.
+		Returns a tuple containing the minimum eccentricity and the error.  All times
+		may be arrays, to reduce many measurements at once.
 		
 		transit		=	time of primary transit in JD
 		transit_error	=	uncertainty of primary transit time in days
@@ -480,11 +655,38 @@ def error_ecosomega(transit, eclipse, period, transit_error=0, eclipse_error=0,
 	#transit_error += period_error*np.abs(transit - eclipse)/period
 	#sigma= np.pi/2*observed_phase_error(transit, eclipse, period, transit_error, eclipse_error/period, period_error)**2
 	sigma= observed_phase_error(transit, eclipse, period, transit_error, eclipse_error/period, period_error)**2
-	sigma*=((ecosomega(((transit-eclipse)/period % 1)+h)-ecosomega(((transit-eclipse)/period % 1)-h))/(2*h))**2
-	if emin == True:
-		return ecosomega(((eclipse - transit)/period) % 1, emin =True), sigma**0.5
-	else:
-		return ecosomega(((eclipse - transit)/period) % 1, emin =True), sigma**0.5	
+	#value and central difference in a single call
+	phase = ((np.asarray(eclipse) - transit)/period) % 1
+	ecos = ecosomega(np.array((phase, phase+h, phase-h)), emin)
+	sigma*=((ecos[1]-ecos[2])/(2*h))**2
+	return ecos[0], sigma**0.5
+
+def fit_ephemeris(times, errors, period_guess, ttrans_guess=None):
+	'''Fits a linear ephemeris, times = ttrans + epoch*period, to measured transit (or eclipse) 
+		times by weighted least squares, solved in closed form.
+		times		=	measured mid-times (JD), an array
+		errors		=	uncertainties of times (days)
+		period_guess	=	approximate period (days), used to number the transits;
+					its error times the number of periods spanned must be
+					well below half a period
+		ttrans_guess	=	time of the transit numbered 0 (default: the most precise
+					measurement)
+	Returns (ttrans, sigma_ttrans), (period, sigma_period), the covariance matrix of 
+	(ttrans, period) and the integer epoch of each measurement.'''
+	times = np.asarray(times, dtype=np.float64)
+	w = 1/np.asarray(errors, dtype=np.float64)**2*np.ones(times.shape)
+	if ttrans_guess is None:
+		ttrans_guess = times[np.argmax(w)]
+	epoch = np.round((times - ttrans_guess)/period_guess)
+	#normal equations, with times relative to ttrans_guess for precision
+	y = times - ttrans_guess
+	s, sx, sxx = np.sum(w), np.sum(w*epoch), np.sum(w*epoch**2)
+	sy, sxy = np.sum(w*y), np.sum(w*epoch*y)
+	det = s*sxx - sx**2
+	ttrans = (sxx*sy - sx*sxy)/det + ttrans_guess
+	period = (s*sxy - sx*sy)/det
+	cov = np.array([[sxx, -sx], [-sx, s]])/det
+	return (ttrans, cov[0,0]**0.5), (period, cov[1,1]**0.5), cov, epoch.astype(int)
 
 def observed_phase_error(transit, eclipse, period, sigma_t=0, sigma_phi=0, sigma_p=0):
 	'''Computes the error associated with the secondary eclipse in phase units.
@@ -510,7 +712,6 @@ def e(phase, omega, error_phase=0, error_omega = 0, epsilon=1e-14):
 		'''
         left = abs(np.pi/2*(phase-0.5))
         right = 1.0
-	h = 1e-8
         while abs(left-right) > epsilon:
 		midpoint = (left+right)/2
 		test = (eclipse_phase(omega, left)-phase)*(eclipse_phase(omega, midpoint)-phase)
@@ -520,12 +721,72 @@ def e(phase, omega, error_phase=0, error_omega = 0, epsilon=1e-14):
 			right = midpoint
 		#print midpoint, eclipse_phase(omega, midpoint)
 	if error_phase != 0 or error_omega != 0:
-		sigma = error_phase**2*((e(phase+h, omega) - e(phase-h, omega))/(2*h))**2
-		sigma += error_omega**2*((e(phase, omega+h) - e(phase, omega-h))/(2*h))**2
-		return midpoint, sigma**0.5
+		def func(phase, omega):
+			return e_array(phase, omega)[0]
+		sigma = propagate(func, (phase, omega), (error_phase, error_omega))[1]
+		return midpoint, sigma[0]
 	else:
 		return midpoint
 
+def e_array(phase, omega, tol=1e-14, maxiter=100, guess=None):
+	'''
+	Array version of e(): computes e for arrays of phase and omega (or any
+	mix of arrays and scalars that broadcast) all at once.  Each element
+	is solved by Newton's method on the eclipse phase, safeguarded by the
+	same bracket as e(), [|pi/2*(phase-0.5)|, 1]: a step that leaves the
+	bracket is replaced by bisection, so it converges like e() but in a
+	few iterations instead of ~50.
+		phase	=	phase of secondary eclipse as a fraction of period
+		omega	=	longitude of periastron in degrees
+		tol	=	convergence tolerance in e
+		maxiter	=	maximum number of iterations
+		guess	=	optional starting values of e (used where they are inside 
+				the bracket), e.g. from a table
+	Returns the array of e and an array of convergence flags.  Elements
+	that did not converge (ie: there is no e in the bracket for that
+	phase and omega) are flagged False.
+	'''
+	phase, omega = np.broadcast_arrays(np.asarray(phase, dtype=np.float64),
+		np.asarray(omega, dtype=np.float64))
+	shape = phase.shape
+	phase = phase.ravel()
+	omega = omega.ravel()
+
+	def residual(k, x):
+		# phase difference, wrapped to [-0.5, 0.5)
+		return (eclipse_phase(omega[k], x) - phase[k] + 0.5) % 1 - 0.5
+
+	left = np.abs(np.pi/2*(phase-0.5))
+	right = np.ones(phase.shape)
+	x = (left+right)/2
+	if guess is not None:
+		guess = np.broadcast_to(np.asarray(guess, dtype=np.float64), shape).ravel()
+		with np.errstate(invalid='ignore'):
+			x = np.where((guess > left) & (guess < right), guess, x)
+	done = np.zeros(phase.shape, dtype=bool)
+	k = np.arange(phase.size)
+	fleft = residual(k, left)
+	for n in range(maxiter):
+		if k.size == 0:
+			break
+		f = residual(k, x[k])
+		#shrink the bracket around the root
+		same = np.sign(f) == np.sign(fleft[k])
+		left[k] = np.where(same, x[k], left[k])
+		right[k] = np.where(same, right[k], x[k])
+		#Newton step, or bisection if it leaves the bracket
+		with np.errstate(divide='ignore', invalid='ignore'):
+			new = x[k] - f/eclipse_phase_de(omega[k], x[k])
+		bad = ~np.isfinite(new) | (new < left[k]) | (new > right[k])
+		new = np.where(bad, (left[k]+right[k])/2, new)
+		new = np.where(f == 0, x[k], new)
+		stop = (np.abs(new-x[k]) < tol) | (right[k]-left[k] < tol)
+		x[k] = new
+		done[k] = stop
+		k = k[~stop]
+	converged = done & (np.abs(residual(np.arange(phase.size), x)) < 1e-9)
+	return x.reshape(shape), converged.reshape(shape)
+
 def impact_parameter(duration, limbtime, rp_rs):
 	b = np.sqrt(duration**2*-rp_rs+duration*rp_rs**2*limbtime+2*duration*rp_rs*limbtime+duration*limbtime-rp_rs**2*limbtime**2-2*rp_rs*limbtime**2-limbtime**2)/np.sqrt(duration*limbtime-limbtime**2) 
 	return b
@@ -533,6 +794,45 @@ def impact_parameter(duration, limbtime, rp_rs):
 	
 #Miscellaneous Functions
 
+def jacobian(func, params, h=1e-8, active=None):
+	'''Computes func and its Jacobian at params by central differences.  All of the
+		perturbed parameter sets are stacked into arrays so that func is called only once.
+		func	=	function of len(params) arguments that accepts arrays and returns
+				an array (or a tuple of arrays) of the same length
+		params	=	parameter values
+		h	=	relative step size (absolute for parameters equal to 0)
+		active	=	Booleans, one for each parameter.  Columns of inactive parameters
+				are not evaluated and are left at 0.
+	Returns the values of func at params and the Jacobian (outputs x parameters).'''
+	params = np.asarray(params, dtype=np.float64)
+	if active is None:
+		active = np.ones(params.size, dtype=bool)
+	k = np.where(active)[0]
+	step = h*np.where(params[k] == 0, 1, np.abs(params[k]))
+	#column 0 is params, then params+step and params-step for each active parameter
+	sets = np.repeat(params[:,np.newaxis], 2*k.size+1, axis=1)
+	sets[k, 1+np.arange(k.size)] += step
+	sets[k, 1+k.size+np.arange(k.size)] -= step
+	values = np.atleast_2d(np.array(func(*sets), dtype=np.float64))
+	jac = np.zeros((values.shape[0], params.size))
+	jac[:,k] = (values[:,1:k.size+1] - values[:,k.size+1:])/(2*step)
+	return values[:,0], jac
+
+def propagate(func, params, sigmas, h=1e-8):
+	'''Propagates uncertainties in params through func to first order, using jacobian().
+		func	=	same as in jacobian()
+		params	=	parameter values
+		sigmas	=	uncertainties of params, or their covariance matrix
+		h	=	relative step size
+	Returns the values of func, their uncertainties, the Jacobian and the covariance 
+	matrix of the values.  Only parameters with nonzero uncertainty are perturbed.'''
+	cov = np.asarray(sigmas, dtype=np.float64)
+	if cov.ndim < 2:
+		cov = np.diag(cov**2)
+	values, jac = jacobian(func, params, h, np.diag(cov) != 0)
+	cov = np.dot(jac, np.dot(cov, jac.T))
+	return values, np.diag(cov)**0.5, jac, cov
+
 def radial_velocity(phase, period, i, m_star, m_planet, e, omega):
 	'''Predicts radial velocity for a given phase measured from the
 		transit time.'''	
@@ -541,11 +841,11 @@ def radial_velocity(phase, period, i, m_star, m_planet, e, omega):
         E_secondary = 2*np.arctan(np.tan((np.pi/2 - omega)/2)/x)
         M_secondary = E_secondary - e*np.sin(E_secondary)
 	phi = M_secondary/(2*np.pi) % 1
-	phase+=phi
+	phase = phase + phi
 	#i = np.pi*i/180
-	period *= 86400	
-	m_star *= 1.98892e30
-	m_planet *= 1.8986e27
+	period = period*86400	
+	m_star = m_star*1.98892e30
+	m_planet = m_planet*1.8986e27
 	M = 2*np.pi*phase
 	f = true_anomaly(e, M)
 	a = (6.673e-11*(m_star+m_planet)*(period/(2*np.pi))**2)**(1/3.0)
@@ -554,27 +854,51 @@ def radial_velocity(phase, period, i, m_star, m_planet, e, omega):
 	v *= (np.cos(f+omega) + e*np.cos(omega))
 	return v
 
+def kepler(M, e, niter=2):
+	'''Solves Kepler's equation, M = E - e*sin(E), for the eccentric anomaly E.
+		M and e may be arrays (they are broadcast together); 0 <= e < 1.
+		Starts from Mikkola's (1987) cubic approximation and takes niter 
+		fourth-order (Danby) steps on all elements at once, which is enough for 
+		machine precision over the whole range of e.
+		M	=	mean anomaly in radians
+		e	=	eccentricity
+		niter	=	number of iterations'''
+	M = np.asarray(M, dtype=np.float64)
+	#reduce M to [-pi, pi) and add the multiple of 2*pi back at the end
+	turns = 2*np.pi*np.floor((M + np.pi)/(2*np.pi))
+	m = M - turns
+	alpha = (1-e)/(4*e+0.5)
+	beta = m/(2*(4*e+0.5))
+	z = np.cbrt(beta + np.sign(beta)*(beta**2 + alpha**3)**0.5)
+	with np.errstate(divide='ignore', invalid='ignore'):
+		s = np.where(z == 0, 0, z - alpha/z)
+	s = s - 0.078*s**5/(1+e)
+	E = m + e*(3*s - 4*s**3)
+	for n in range(niter):
+		esin = e*np.sin(E)
+		ecos = e*np.cos(E)
+		f = E - esin - m
+		f1 = 1 - ecos
+		d1 = -f/f1
+		d2 = -f/(f1 + d1*esin/2)
+		d3 = -f/(f1 + d2*esin/2 + d2**2*ecos/6)
+		E = E + d3
+	return E + turns
+
 def true_anomaly(e, M):
-	'''x = np.zeros(1000)
-	f = np.zeros(len(M))
-	for j in range(0, len(M)):
-	        x[0] = M[j]
-		i = 0        	
-		while abs(x[i]-x[i-1])>1e-14 or i < 512:
-			x[i+1] = x[i] + (M[j]+e*np.sin(x[i])-x[i])/(1-e*np.cos(x[i]))
-			i+=1
-		f[j] = 2*(np.arctan(((1+e)/(1-e))**0.5*np.tan(x[i]/2)))'''
-	f = M + (2*e-0.25*e**3)*np.sin(M)+5/4*e**2*np.sin(2*M)+13/12*e**3*np.sin(3*M)
-	return f
+	'''Computes the true anomaly for mean anomaly M (radians) using kepler().
+		Like M, the result is not wrapped to [0, 2*pi).'''
+	E = kepler(M, e)
+	beta = e/(1 + (1-e**2)**0.5)
+	return E + 2*np.arctan(beta*np.sin(E)/(1 - beta*np.cos(E)))
 
 def relativistic_precession(m_star, period, e):
 	'''Returns approximate relativistic precession in degrees per year.
 		m_star	=	mass of star in solar masses
 		period	=	period of planet in days
 		e	=	eccentricity of orbit'''
-	m_star*=1.98892e30
-	period*=86400
-	c = 299792458
+	m_star = m_star*msun
+	period = period*86400
 	G= 6.673e-11
 	p = 6*180*G*m_star/(c**2*((period/(2*np.pi))**2*G*m_star)**(1/3.0)*(1-e**2))
 	p*= 365.25/(period/86400)
@@ -585,12 +909,34 @@ def GR_eclipse(m_star, period, e, omega):
 	-eclipse_phase(omega, e))
 
 def rwprecession(m_star, m_planet, r_planet, period, e, k2p=0.3):
-	k = 0.01721209885
-	a = ((period*k)**2/m_star)**(1/3.)
+	k = 0.01720209895
+	#semimajor axis in AU (Kepler's third law in AU, days, and solar masses)
+	a = ((k*period)**2*m_star/(4*np.pi**2))**(1/3.)
 	omega_dot = 3.26e-10*(k2p/0.3)*(m_star**1.5)*(1./m_planet)*(r_planet)**5*(a/0.025)**(-13/2.)
 	precper = 2*np.pi/(omega_dot) #seconds
 	return precper/(86400*365.25), e*period/np.pi*1440
 
+def precession_drift(m_star, m_planet, r_planet, period, e, omega, years, k2p=0.3):
+	'''Projects the drift of the secondary eclipse time caused by apsidal precession,
+		general-relativistic (relativistic_precession()) plus tidal (rwprecession()).  
+		All arguments may be arrays, eg: one element per target.
+		m_star	=	mass of star in solar masses
+		m_planet=	mass of planet in jovian masses
+		r_planet=	radius of planet in jovian radii
+		period	=	period of orbit in days
+		e	=	eccentricity
+		omega	=	longitude of periastron in degrees
+		years	=	time over which to project the drift, in years
+		k2p	=	Love number of the planet
+	Returns the relativistic and tidal precession rates (degrees per year) and the 
+	drift of the eclipse relative to the transit after years (seconds).'''
+	omega_gr = relativistic_precession(m_star, period, e)
+	with np.errstate(divide='ignore', invalid='ignore'):
+		omega_tidal = 360/rwprecession(m_star, m_planet, r_planet, period, e, k2p)[0]
+	dphase = eclipse_phase(omega + (omega_gr + omega_tidal)*years, e) - eclipse_phase(omega, e)
+	drift = ((dphase + 0.5) % 1 - 0.5)*period*86400
+	return omega_gr, omega_tidal, drift
+
 #Defunct Functions
 '''
 def area(nu, e):
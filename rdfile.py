@@ -1,6 +1,9 @@
 import numpy    as np
 import julday   as jd
 import datetime as dt
+import os
+import re
+import hashlib
 
 def rdfile(fname):
     """
@@ -87,7 +90,7 @@ def rdfile(fname):
     handle.close()  # done; close the file
     return data
 
-def rdvis(fname, juldat=False):
+def rdvis(fname, juldat=False, now=None, cache=False):
     """
 SYNTAX:
     viswindows = readvis(filename)
@@ -101,7 +104,17 @@ INPUTS:
            is not in the current working directory.
     
        jd: Optional param; if specified as True, it will return an array
-           of Julian dates.
+           of Julian dates, of shape (n, 2) (window open and close).
+
+      now: Optional param; the Julian date before which windows are
+           dropped as past.  Defaults to the current date and time.
+
+    cache: Optional param; if True, the parsed windows are stored in
+           a binary file next to the .vis file (<fname>.npz), and read
+           from it on later calls instead of parsing the text, as long
+           as the .vis file's path, size, and modification time are
+           unchanged.  May also be the name of a directory to keep the
+           cache files in.
 
 OUTPUTS:
     This function returns a 3D array containing each visibility window 
@@ -124,7 +137,7 @@ RESTRICTIONS:
     Julday must be installed and imported.
 
 SIDE EFFECTS:
-    None
+    Writes the cache file if cache is given.
 
 EXAMPLE/TEST:
 
@@ -139,101 +152,151 @@ MODIFICATION HISTORY:
 2009-02-10 0.2    Christopher Campo, UCF    Only returns dates from today+
                   ccampo@gmail.com
     """
+    # parsed windows, from the cache if it is up to date
+    windows = None
+    if cache != False:
+        cname   = viscachename(fname, cache)
+        windows = rdviscache(fname, cname)
+    if windows is None:
+        windows = parsevis(fname)
+        if cache != False:
+            wrviscache(fname, cname, windows)
+
+    # the date NOW (to compare), computed once
+    if now is None:
+        now = dt.datetime.now()
+        now = jd.julday(now.month, now.day, now.year, now.hour, \
+                            now.minute, now.second)
+
+    # convert every window open and close at once; shape (n, 2)
+    dates = jd.julday(windows[:, :, 0], windows[:, :, 1], \
+                          windows[:, :, 2], windows[:, :, 3], \
+                          windows[:, :, 4], windows[:, :, 5])
+
+    # drop windows that closed in the past
+    future  = now - dates[:, 1] <= 0
+    windows = windows[future]
+    dates   = dates[future]
+
+    if juldat == False:
+        return windows
+    else:
+        return dates
+
+# used to convert words to numbers
+months = {
+    'Jan': 1.,
+    'Feb': 2.,
+    'Mar': 3.,
+    'Apr': 4.,
+    'May': 5.,
+    'Jun': 6.,
+    'Jul': 7.,
+    'Aug': 8.,
+    'Sep': 9.,
+    'Oct': 10.,
+    'Nov': 11.,
+    'Dec': 12.,
+    }
+
+# a date in a .vis file, ie: 2009 Feb 17 17:57:00
+visdate = re.compile(r'(\d+)\s+([A-Za-z]{3})\s+(\d+)\s+(\d+):(\d+):(\d+(?:\.\d*)?)')
+
+def parsevis(fname):
+    """
+    Parse every visibility window of a .vis file (past windows
+    included).  Used by `rdvis`.
+
+    Parameters
+    ----------
+    fname : string
+        The .vis file to be read.
+
+    Returns
+    -------
+    windows : ndarray
+        Array of shape (n, 2, 6) of the window open and close dates,
+        each as [month, day, year, hours, minutes, seconds].
+    """
     fin = open(fname, 'r')
 
-    flag = False
-    
-    # used to convert words to numbers
-    months = {
-        'Jan': 1.,
-        'Feb': 2.,
-        'Mar': 3.,
-        'Apr': 4.,
-        'May': 5.,
-        'Jun': 6.,
-        'Jul': 7.,
-        'Aug': 8.,
-        'Sep': 9.,
-        'Oct': 10.,
-        'Nov': 11.,
-        'Dec': 12.,
-        }
-    
+    flag    = False
     windows = []
 
     for line in fin:
-        line = line.rstrip()
-        
+        line = line.strip()
+
         # ignore comments and white space
-        if len(line) < 1:
-            continue
-        elif line[0] == '#':
+        if len(line) < 1 or line[0] == '#':
             continue
-        
-        # split the line into words
-        parts = line.split()
 
         # everything after the word windows becomes data we need
-        if parts[0].lower() == 'windows':
-            flag = True
+        if flag == False:
+            if line.split(None, 1)[0].lower() == 'windows':
+                flag = True
             continue
 
-        if flag == True:
-            win = []
-
-            hmd_open  = parts[3].split(':') 
-            hmd_close = parts[-2].split(':') 
-            
-            # window open list
-            mon     = months[parts[1]]
-            day     = float(parts[2])
-            year    = float(parts[0])
-            hr      = float(hmd_open[0])
-            min     = float(hmd_open[1])
-            sec     = float(hmd_open[2])
-            openwin = [mon, day, year, hr, min, sec]
-
-            # window close list
-            mon      = months[parts[-4]]
-            day      = float(parts[-3])
-            year     = float(parts[-5])
-            hr       = float(hmd_close[0])
-            min      = float(hmd_close[1])
-            sec      = float(hmd_close[2])
-            closewin = [mon, day, year, hr, min, sec]
-        
-            # the date NOW (to compare)
-            now  = dt.datetime.now()
-            now  = jd.julday(now.month, now.day, now.year, now.hour, \
-                                 now.minute, now.second)
-            
-            # current date, in Julian
-            crnt = jd.julday(closewin[0], closewin[1], closewin[2], \
-                                 closewin[3], closewin[4], closewin[5])
-
-            # check if date is in the past
-            if now - crnt <= 0:
-                win.append(openwin)
-                win.append(closewin)
-                windows.append(win)
+        # one pass over the line gets every date on it; the first
+        # is the window open and the last is the window close.
+        dates = visdate.findall(line)
+        if len(dates) < 2:
+            fin.close()
+            raise ValueError("Bad window line in {0}: {1}".format(fname, line))
+        win = []
+        for year, mon, day, hr, min, sec in (dates[0], dates[-1]):
+            win.append([months[mon], float(day), float(year),
+                        float(hr), float(min), float(sec)])
+        windows.append(win)
 
     fin.close()
-    windows = np.array(windows, dtype=np.float64)
+    return np.array(windows, dtype=np.float64).reshape((-1, 2, 6))
 
-    if juldat == False:
-        return windows
-    else:        
-        # the final array of julian dates
-        dates = []
-
-        # loop thru each window, convert to dates.
-        for i in range(len(windows)):
-            temp = []
-            for k in range(len(windows[i])):
-                j = jd.julday(windows[i][k][0], windows[i][k][1], \
-                                  windows[i][k][2], windows[i][k][3], \
-                                  windows[i][k][4], windows[i][k][5])
-                temp.append(j)
-            dates.append(temp)
-
-        return np.array(dates, dtype=np.float64)
+def viscachename(fname, cache):
+    """
+    Return the name of the cache file of a .vis file.  If `cache` is
+    a directory, the cache file is kept there (named after a hash of
+    the full path of the .vis file); otherwise it is kept next to the
+    .vis file, as <fname>.npz.
+    """
+    if cache == True:
+        return fname + '.npz'
+    path = os.path.abspath(fname)
+    if not isinstance(path, bytes):
+        path = path.encode('utf-8')
+    return os.path.join(cache, hashlib.md5(path).hexdigest() + '.npz')
+
+def rdviscache(fname, cname):
+    """
+    Return the parsed windows stored in the cache file `cname`, or
+    None if there is no cache file or it does not match the current
+    path, size, and modification time of the .vis file `fname`.
+    """
+    try:
+        stat = os.stat(fname)
+        with np.load(cname) as cached:
+            if str(cached['path']) != os.path.abspath(fname) or \
+               int(cached['size']) != stat.st_size or \
+               float(cached['mtime']) != stat.st_mtime:
+                return None
+            return np.array(cached['windows'])
+    except (IOError, OSError, KeyError, ValueError):
+        return None
+
+def wrviscache(fname, cname, windows):
+    """
+    Store the parsed windows of the .vis file `fname` in the cache
+    file `cname`, keyed on the file's path, size, and modification
+    time.  The file is written under a temporary name and then
+    renamed, so other processes never read half a file.  A cache
+    that cannot be written is ignored.
+    """
+    try:
+        stat = os.stat(fname)
+        tmp  = '{0}.{1}.tmp'.format(cname, os.getpid())
+        fout = open(tmp, 'wb')
+        np.savez(fout, windows=windows, path=os.path.abspath(fname),
+                 size=stat.st_size, mtime=stat.st_mtime)
+        fout.close()
+        os.rename(tmp, cname)
+    except (IOError, OSError):
+        pass
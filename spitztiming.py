@@ -40,6 +40,11 @@ EXAMPLE/TEST:
      print spitztiming(julday(10, 10, 2005, 2, 34, 56),
                        julday(12, 12, 2006, 3, 45, 34)
 
+NOTES:
+     The start and end times are rounded to the nearest second before
+     they are split into date and time, so a time never shows 60
+     seconds or minutes, or hour 24.
+
 MODIFICATION HISTORY:
 2008-12-29 0.1  Christopher Campo, UCF     Initial version.
                 ccampo@gmail.com
@@ -51,12 +56,8 @@ MODIFICATION HISTORY:
                 ccampo@gmail.com
     """
     
-    # default assumes input is a scalar
-    scalar = True
-
     # check if input is an array
     if type(jdstart) == np.ndarray and type(jdend) == np.ndarray:
-        scalar = False
         # check shape of arrays
         if(jdstart.shape != jdend.shape):
             raise TypeError, 'Error: arrays jdstart and jdend must have the same shape'
@@ -71,70 +72,47 @@ MODIFICATION HISTORY:
   
     dif = jdend - jdstart
 
-    if scalar == False:
-        # make sure each end date is after the start date
-        difar = dif < 0
-        if(difar.all() == True):
-            raise TypeError, 'Error: each end time must be later than corresponding start time'
-    elif dif < 0:
+    # make sure each end date is after the start date
+    if np.any(dif < 0):
         raise TypeError, 'Error: each end time must be later than corresponding start time'
 
-    if scalar == False:
-        # number of timing constraints to be generated
-        ntime = jdstart.size
-    else:
-        ntime = 1
+    # round the start and end times to whole seconds first, as
+    # integer seconds since Julian date -0.5 (a midnight), so the
+    # seconds, minutes, hours, and day always carry correctly.
+    ssec = np.round((np.ravel(jdstart) + 0.5) * 86400.).astype(np.int64)
+    esec = np.round((np.ravel(jdend)   + 0.5) * 86400.).astype(np.int64)
+
+    # number of timing constraints to be generated
+    ntime = ssec.size
+
+    # calendar fields of the start and end times
+    syear, smon, sday, stime = calfields(ssec)
+    eyear, emon, eday, etime = calfields(esec)
+
+    # the list of strings (timing constraints), built all at once
+    tfmt  = 'TIMING%d:  START_DATE=%d %s %2d, START_TIME=%8s, END_DATE=%d %s %2d, END_TIME=%s'
+    tlist = [tfmt % str_var for str_var in zip(range(1, ntime + 1), syear, smon, sday, \
+                                                   stime, eyear, emon, eday, etime)]
 
-    # the list of strings (constraints) to be returned
-    tlist = []
-  
-    # converts julian to gregorian
-    sdate = caldat.caldat(jdstart, verbose=True)
-    edate = caldat.caldat(jdend, verbose=True)
-
-    # append the list with each timing constraint;
-    # loops through the entire range of timing constraints.
-    for i in range(ntime):
-        if scalar == True:
-            hr  = np.array([sdate[3], edate[3]])
-            min = np.array([sdate[4], edate[4]])
-            sec = np.array([sdate[5], edate[5]])
-        else:
-            hr  = np.array([sdate[i][3], edate[i][3]])
-            min = np.array([sdate[i][4], edate[i][4]])
-            sec = np.array([sdate[i][5], edate[i][5]])
-
-        # FINDME: 7/20/2010 remove 60 seconds bug
-        if np.round(sec[0]) == 60:
-            min[0] += 1
-            sec[0]  = 0
-        if np.round(sec[1]) == 60:
-            min[1] += 1
-            sec[1]  = 0
-
-        # FINDME: 7/28/2011 remove 60 minute bug
-        if np.round(min[0]) == 60:
-            hr[0] += 1
-            min[0] = 0
-        if np.round(min[1]) == 60:
-            hr[1] += 1
-            min[1] = 0
-
-        # get start and end times
-        stvals = (hr[0], min[0], sec[0])
-        etvals = (hr[1], min[1], sec[1])
-        stime  = '%02d:%02d:%02.0f' % (stvals) 
-        etime  = '%02d:%02d:%02.0f' % (etvals)
-        
-        if scalar == False:
-            str_var = (i+1, sdate[i][2], sdate[i][0], sdate[i][1], stime, \
-                         edate[i][2], edate[i][0], edate[i][1], etime)
-        else:
-            str_var = (i+1, sdate[2], sdate[0], sdate[1], stime, edate[2],\
-                         edate[0], edate[1], etime)
-      
-        tstr = 'TIMING%d:  START_DATE=%d %s %2d, START_TIME=%8s, END_DATE=%d %s %2d, END_TIME=%s' % str_var
-        tlist.append(tstr)
-      
     # the list of strings (timing constraints)
     return tlist
+
+def calfields(secs):
+    """
+    Return the year, month name, and day of the month (as lists) and
+    the time of day (as a list of hh:mm:ss strings) of an array of
+    integer seconds since Julian date -0.5.  Used by spitztiming.
+    """
+    days = secs // 86400
+    sod  = secs %  86400
+
+    # the Julian date of each day's midnight gives the calendar date
+    mon, day, year = caldat.caldat_array(days - 0.5)[:3]
+    mon = np.array(caldat.months)[mon - 1]
+
+    hr   = sod // 3600
+    min  = sod %  3600 // 60
+    sec  = sod %  60
+    time = ['%02d:%02d:%02d' % hms for hms in zip(hr.tolist(), min.tolist(), sec.tolist())]
+
+    return year.tolist(), mon.tolist(), day.tolist(), time
@@ -7,7 +7,7 @@ import numpy as np
 
 def spitztimingrep(planet, event, evphase, obsdur, startwin, obswin,\
                        teph, period, toff=0, ctrshift=0,\
-                       type='ingress', errphase=0, ecldur=None):
+                       type='ingress', errphase=0, ecldur=None, eccorb=None):
     """
 NAME:
       spitztimingrep
@@ -51,6 +51,12 @@ INPUTS:
                 other inputs will return the ingress timing constraints
                 by default.
 
+      eccorb:   Optional; dict of the orbit parameters of routine
+                eccorbphase_windows (e, omega, and optionally omega_dot,
+                a, i).  If given, event times come from that routine
+                instead of circorbphase, and event must be 'transit' or
+                'eclipse' (evphase is then not used).
+
 OUTPUTS:
       This function returns the spitzer timing constraint string
       for ingress or egress OR the event mid-times with error estimates.
@@ -92,8 +98,53 @@ MODIFICATION HISTORY:
      2009-01-11   0.2    Christopher Campo, UCF    Added mid-times
                          ccampo@gmail.com
     """
+    timing = eventtiming(planet, {event: evphase}, obsdur, startwin, obswin, \
+                             teph, period, toff, ctrshift, errphase=errphase, \
+                             ecldur=ecldur, parts=(type,), eccorb=eccorb)
+    return timing[event].get(type)
+
+def eventtiming(planet, events, obsdur, startwin, obswin, teph, period, \
+                    toff=0, ctrshift=0, errphase=0, ecldur=None, \
+                    parts=('midtimes', 'ingress', 'egress'), eccorb=None):
+    """
+    Calculate the times, mid-time listing, and Spitzer timing
+    constraints of several orbital events (ie: eclipse and transit)
+    in one pass, so callers that need more than one of them share a
+    single calculation.  spitztimingrep is this routine for one event
+    and one output.
+
+    Parameters
+    ----------
+    planet : string
+        Name of the planet.
+    events : dict
+        Phase of each event to calculate, keyed on the event name,
+        ie: {'eclipse': 0.5, 'transit': 0.}.
+    obsdur, startwin, obswin, teph, period, toff, ctrshift, errphase, ecldur :
+        Same as in spitztimingrep.
+    parts : tuple or dict
+        Which outputs to calculate: any of 'midtimes', 'ingress', and
+        'egress'.  Either one tuple for every event, or a dict of
+        tuples keyed on the event name.
+    eccorb : dict
+        Orbit parameters for eccorbphase_windows (e, omega, and
+        optionally omega_dot, a, i).  If given, the events (which
+        must then be named 'transit' or 'eclipse') are calculated for
+        that eccentric, precessing orbit and their phases are not
+        used; otherwise the orbit is circular (circorbphase).
+
+    Returns
+    -------
+    timing : dict
+        A dict for each event (keyed on the event name), holding the
+        event mid-times ('times', Julian dates), their errors
+        ('errors', days), and those of 'midtimes' (the mid-time
+        listing string), 'ingress', and 'egress' (lists of timing
+        constraint strings) that were asked for.
+    """
     import numpy as np
     import circorbphase as cop
+    import eccorbphase as ecop
     import spitztiming as st
     import caldat as cal
 
@@ -106,53 +157,54 @@ MODIFICATION HISTORY:
         ictrshift = ctrshift
 
     s2d = 1. / 86400. # conversion factor for seconds to days
-  
-    for i in range(len(obswin)):
-        if i == 0:
-            ecl = cop.circorbphase(teph, period, obswin[i][0], obswin[i][1], \
-                                       toff, evphase, errphase=errphase)
+
+    timing = {}
+    for event in events:
+        if type(parts) == dict:
+            evparts = parts[event]
+        else:
+            evparts = parts
+
+        # events in all of the windows at once
+        if eccorb is None:
+            ecl = cop.circorbphase_windows(teph, period, obswin, toff, \
+                                               events[event], errphase=errphase)[0]
         else:
-            ecl = np.concatenate((ecl, cop.circorbphase(teph, \
-                                                            period, obswin[i][0], \
-                                                            obswin[i][1], toff, \
-                                                            evphase, errphase=errphase)), axis=1)
-
-    # event mid-times with errors
-    dates = np.array(cal.caldat(ecl[0][:]), dtype=np.float64)
-    dates = np.transpose(dates)
-    mon   = dates[0]
-    day   = dates[1]
-    year  = dates[2]
-    hour  = dates[3]
-    min   = dates[4]
-    sec   = dates[5]
-
-    uncert = ecl[1][:] * 24. * 60. * 60.
-    mid    = np.transpose([year, mon, day, hour, min, sec, \
-                            uncert])
-    
-    midtimes = 'Times of %s %s, solar-system barycenter:\n'  % (planet, event)
-    
-    # format the string of event midtimes and errors
-    for i in range(len(mid)):
-        midtimes += '%4.0f   %2.0f   %2.0f   %4.0f   %2.0f   %6.3f  +- %10.3f sec\n' % \
-            (mid[i][0], mid[i][1], mid[i][2], mid[i][3], mid[i][4], mid[i][5],\
-                 mid[i][6])
-            
-    # constraints for ingress
-    dt      = np.max((ecldur/2., 2*3600.)) # ecl offset FINDME
-    jdstart = ecl[0][:] - (dt + ictrshift + ecldur/2. + startwin / 2.) * s2d  # start evnt before baseline 
-    jdend   = jdstart + startwin * s2d
-    iconst  = st.spitztiming(jdstart, jdend)
-
-    # constraints for egress
-    jdstart = ecl[0][:] - (ictrshift + startwin / 2.) * s2d
-    jdend   = jdstart + startwin * s2d
-    econst  = st.spitztiming(jdstart, jdend)
-
-    if type == 'midtimes':
-        return midtimes
-    elif type == 'egress':
-        return econst
-    elif type == 'ingress':
-        return iconst
+            ecl = ecop.eccorbphase_windows(teph, period, obswin, toff=toff, \
+                                               event=event, errphase=errphase, \
+                                               **eccorb)[0]
+        evtiming = {'times': ecl[0], 'errors': ecl[1]}
+
+        if 'midtimes' in evparts:
+            # event mid-times with errors
+            mon, day, year, hour, min, sec = cal.caldat_array(ecl[0][:])
+
+            uncert = ecl[1][:] * 24. * 60. * 60.
+            mid    = np.transpose([year, mon, day, hour, min, sec, \
+                                    uncert])
+
+            midtimes = 'Times of %s %s, solar-system barycenter:\n'  % (planet, event)
+
+            # format the string of event midtimes and errors
+            for i in range(len(mid)):
+                midtimes += '%4.0f   %2.0f   %2.0f   %4.0f   %2.0f   %6.3f  +- %10.3f sec\n' % \
+                    (mid[i][0], mid[i][1], mid[i][2], mid[i][3], mid[i][4], mid[i][5],\
+                         mid[i][6])
+            evtiming['midtimes'] = midtimes
+
+        if 'ingress' in evparts:
+            # constraints for ingress
+            dt      = np.max((ecldur/2., 2*3600.)) # ecl offset FINDME
+            jdstart = ecl[0][:] - (dt + ictrshift + ecldur/2. + startwin / 2.) * s2d  # start evnt before baseline 
+            jdend   = jdstart + startwin * s2d
+            evtiming['ingress'] = st.spitztiming(jdstart, jdend)
+
+        if 'egress' in evparts:
+            # constraints for egress
+            jdstart = ecl[0][:] - (ictrshift + startwin / 2.) * s2d
+            jdend   = jdstart + startwin * s2d
+            evtiming['egress'] = st.spitztiming(jdstart, jdend)
+
+        timing[event] = evtiming
+
+    return timing
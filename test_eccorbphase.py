@@ -0,0 +1,41 @@
+# regression checks of eccorbphase against circorbphase and Kepler's
+# equation; run with py.test from this directory.
+import numpy as np
+import circorbphase as cop
+import eccorbphase as ecp
+import orbit
+
+TEPH   = np.array([2455000.3, 1e-4])
+PERIOD = np.array([1.0914, 1e-6])
+# a window every 50 days for two years
+OBSWIN = 2455003. + np.arange(0, 730, 50.)[:, None] + np.array([0., 4.])
+
+def test_circular_limit():
+    # without precession (or light time) the events are those of the
+    # fixed eclipse phase
+    for e, omega in [(0., 0.), (0.05, 90.), (0.3, 200.), (0.1, 330.)]:
+        for event, evphase in [('transit', 0.), ('eclipse', orbit.eclipse_phase(omega, e))]:
+            ecl, index = ecp.eccorbphase_windows(TEPH, PERIOD, OBSWIN, e, omega,
+                                                 event=event, errphase=1e-3)
+            ref, rindex = cop.circorbphase_windows(TEPH, PERIOD, OBSWIN, evphase=evphase,
+                                                   errphase=1e-3)
+            assert np.all(index == rindex)
+            assert np.max(np.abs(ecl[0] - ref[0])) * 86400 < 1e-3
+            assert np.allclose(ecl[1], ref[1], rtol=1e-9, atol=0)
+
+def test_precession():
+    # with omega advancing, every event is at true anomaly fev - omega(t)
+    # of a planet moving with the anomalistic period
+    e, omega, omega_dot = 0.1, 40., 20.
+    Panom = PERIOD[0] / (1 - omega_dot * PERIOD[0] / 360. / 365.25)
+    M0 = ecp.meananomaly(np.pi/2 - omega*np.pi/180., e)
+    for event, fev in [('transit', np.pi/2), ('eclipse', 3*np.pi/2)]:
+        ecl = ecp.eccorbphase_windows(TEPH, PERIOD, OBSWIN, e, omega, omega_dot, event=event)[0]
+        assert ecl.shape[1] > 40
+        f = orbit.true_anomaly(e, M0 + 2*np.pi*(ecl[0] - TEPH[0])/Panom)
+        w = (omega + omega_dot*(ecl[0] - TEPH[0])/365.25) * np.pi/180.
+        assert np.max(np.abs((f + w - fev + np.pi) % (2*np.pi) - np.pi)) < 1e-8
+    # and the eclipse drifts away from the fixed-omega prediction
+    fixed = ecp.eccorbphase_windows(TEPH, PERIOD, OBSWIN, e, omega, event='eclipse')[0]
+    drift = (ecl[0] - fixed[0]) * 86400
+    assert np.all(np.abs(np.diff(drift)) > 0) and np.abs(drift[-1]) > 1000
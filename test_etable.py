@@ -0,0 +1,35 @@
+# checks of the e(phase, omega) table against orbit.e_array; run with
+# py.test from this directory.
+import numpy as np
+import etable
+import orbit
+
+def test_build_load_lookup(tmpdir):
+    fname = str(tmpdir.join('et.npy'))
+    table = etable.build(fname, nphase=401, nomega=361)
+    assert table.shape == (401, 361)
+    loaded = etable.load(fname)
+    assert isinstance(loaded, np.memmap) and etable.load(fname) is loaded
+    assert np.array_equal(np.isnan(loaded), np.isnan(table))
+    assert np.all(loaded[~np.isnan(table)] == table[~np.isnan(table)])
+
+    np.random.seed(15)
+    phase = np.random.uniform(0.3, 0.7, 500)
+    omega = np.random.uniform(0, 360, 500)
+    ref, conv = orbit.e_array(phase, omega)
+    # the table, a loaded table, and its file name (str or unicode, as
+    # aorserver passes from JSON) all give the same e
+    e = etable.lookup(table, phase, omega)
+    for t in (loaded, fname, unicode(fname)):
+        np.testing.assert_array_equal(etable.lookup(t, phase, omega), e)
+    # bilinear interpolation, away from the cells next to a missing e
+    good = conv & ~np.isnan(e)
+    assert good.sum() > 150
+    assert np.median(np.abs(e - ref)[good]) < 1e-4
+    # polished values are those of e_array
+    e = etable.lookup(fname, phase, omega, polish=True)
+    assert np.array_equal(np.isnan(e), ~conv)
+    assert np.max(np.abs(e - ref)[conv]) < 1e-12
+    # scalars give scalars
+    assert np.ndim(etable.lookup(fname, 0.52, 10.)) == 0
+    assert abs(etable.lookup(fname, 0.5, 0.)) < 1e-12
@@ -0,0 +1,41 @@
+# checks of mcorbphase against the linear errors of circorbphase; run
+# with py.test from this directory.
+import numpy as np
+import circorbphase as cop
+import mcorbphase as mcop
+import orbit
+
+TEPH   = np.array([2454746.28890, 0.0007])
+PERIOD = np.array([2.2437563, 0.000009])
+OBSWIN = np.array([[2454880.25, 2454928.35], [2455034.75, 2455084.55]])
+
+def test_uncorrelated_limit():
+    # uncorrelated, small errors: the linear errors of circorbphase
+    ref, rindex = cop.circorbphase_windows(TEPH, PERIOD, OBSWIN, evphase=0.5)
+    ecl, pct, index = mcop.mcorbphase(TEPH, PERIOD, OBSWIN, 20000, evphase=0.5, seed=12)
+    assert np.all(index == rindex)
+    assert np.all(ecl[0] == ref[0])
+    assert np.max(np.abs(ecl[1] / ref[1] - 1)) < 0.02
+    # the median and 1-sigma percentiles of a normal distribution
+    assert np.max(np.abs(pct[2] - ref[0]) / ref[1]) < 0.05
+    assert np.max(np.abs((pct[3] - pct[1]) / (2 * ref[1]) - 1)) < 0.03
+
+def test_eccentric():
+    # with e and omega, the nominal event is the secondary eclipse
+    e, omega = [0.087, 0.002], [-1.6, 1.2]
+    ecl = mcop.mcorbphase(TEPH, PERIOD, OBSWIN, 20000, e=e, omega=omega, seed=12)[0]
+    ref = cop.circorbphase_windows(TEPH, PERIOD, OBSWIN,
+                                   evphase=orbit.eclipse_phase(omega[0], e[0]))[0]
+    assert np.all(ecl[0] == ref[0])
+    assert np.all(ecl[1] > ref[1])
+
+def test_chunks():
+    # processing a few events at a time gives the same percentiles
+    args = (TEPH, PERIOD, OBSWIN, 5000)
+    ecl, pct, index = mcop.mcorbphase(*args, e=[0.087, 0.002], omega=[-1.6, 1.2], seed=3)
+    for maxmem in (3 * 8 * 5000, 10 * 3 * 8 * 5000):
+        ecl2, pct2, index2 = mcop.mcorbphase(*args, e=[0.087, 0.002], omega=[-1.6, 1.2],
+                                             seed=3, maxmem=maxmem)
+        assert np.all(pct2 == pct) and np.all(index2 == index)
+        # (up to the order of the sums of the standard deviation)
+        assert np.all(ecl2[0] == ecl[0]) and np.allclose(ecl2[1], ecl[1], rtol=1e-9, atol=0)
@@ -0,0 +1,498 @@
+# regression checks of the vectorized and closed-form routines of orbit
+# against the scalar calculations they replaced (copied below from the
+# earlier orbit.py); run with py.test from this directory.
+import numpy as np
+import orbit
+
+def base_e(phase, omega, epsilon=1e-14):
+    """
+    orbit.e as it was: bisection on the eclipse phase.
+    """
+    left  = abs(np.pi/2*(phase-0.5))
+    right = 1.0
+    while abs(left-right) > epsilon:
+        midpoint = (left+right)/2
+        test = (orbit.eclipse_phase(omega, left)-phase)*(orbit.eclipse_phase(omega, midpoint)-phase)
+        if test > 0:
+            left = midpoint
+        else:
+            right = midpoint
+    return midpoint
+
+def phase_residual(e, phase, omega):
+    """
+    Eclipse phase of e and omega less phase, wrapped to [-0.5, 0.5).
+    """
+    return (orbit.eclipse_phase(omega, e) - phase + 0.5) % 1 - 0.5
+
+def test_e_array():
+    np.random.seed(9)
+    phase = np.random.uniform(0.05, 0.95, 300)
+    omega = np.random.uniform(0, 360, 300)
+    # omega at 0, pi/2, pi, and 3pi/2
+    phase = np.r_[phase, 0.3, 0.7, 0.3, 0.7, 0.45, 0.55, 0.45, 0.55]
+    omega = np.r_[omega, 0., 0., 180., 180., 90., 90., 270., 270.]
+    ecc, conv = orbit.e_array(phase, omega)
+    ref = np.array([base_e(p, w) for p, w in zip(phase, omega)])
+    # the bisection has no convergence flag; it ends at the bracket
+    # edge when there is no root
+    found = np.abs(phase_residual(ref, phase, omega)) < 1e-9
+    assert np.all(conv == found)
+    assert found.sum() > 100
+    assert np.max(np.abs(ecc - ref)[conv]) < 1e-12
+    assert list(conv[-8:]) == [False, True, True, False, False, False, False, False]
+
+def test_e_array_circular():
+    # phase 0.5 is e = 0 for every omega but pi/2 and 3pi/2 (where every
+    # e gives phase 0.5)
+    ecc, conv = orbit.e_array(0.5, np.array([0., 45., 180., 300.]))
+    assert np.all(conv)
+    assert np.max(ecc) < 1e-12
+    ecc, conv = orbit.e_array(0.5, np.array([90., 270.]))
+    assert np.all(conv)
+    assert np.max(np.abs(phase_residual(ecc, 0.5, np.array([90., 270.])))) < 1e-12
+
+def test_e_array_broadcast():
+    ecc, conv = orbit.e_array(np.array([[0.52], [0.55]]), np.array([10., 20., 30.]))
+    assert ecc.shape == conv.shape == (2, 3)
+    for j in range(2):
+        for k in range(3):
+            assert abs(ecc[j, k] - base_e([0.52, 0.55][j], [10., 20., 30.][k])) < 1e-12
+
+def base_duration(e, period, omega, m_star, r_star, r_planet, i=np.pi/2, primary=True, b=0):
+    """
+    orbit.duration as it was (0 where the occultation is impossible).
+    """
+    if primary == True:
+        theta = np.pi*(90-omega)/180.0
+    else:
+        theta = np.pi*(90+omega)/180.0
+    m_star *= orbit.msun
+    period *= 86400
+    G = 6.673e-11
+    a = (G*m_star*(period/(2*np.pi))**2)**(1/3.0)
+    r = a*(1-e**2)/(1+e*np.cos(theta))
+    d = 2*(r_star+r_planet)*(1-e**2)**0.5
+    d *= 1/(1 + e*np.cos(theta))
+    d *= (period/(2*np.pi*G*m_star))**(1/3.0)
+    if np.cos(i)*r/r_star > (r_planet+r_star)/r_star or b > (r_planet+r_star)/r_star:
+        return 0
+    elif b == 0:
+        d *= (1- ((r*np.cos(i))/(r_planet+r_star))**2)**0.5
+        return d/60
+    else:
+        d *= (1- ((b*r_star)/(r_planet+r_star))**2)**0.5
+        return d/60
+
+def base_e_duration(eclipse_phase, width, period, m_star, r_star, r_planet, i=np.pi/2, primary=True, b=0):
+    """
+    orbit.e_duration as it was: bisection over omega in [-360, 360].
+    """
+    left  = -360.0
+    right = 360.0
+    x = 0
+    while abs(left-right) > 1e-14:
+        midpoint = (left+right)/2
+        test = (base_duration(base_e(eclipse_phase, left), period, left, m_star, r_star, r_planet, i, primary, b)-width)
+        test*= (base_duration(base_e(eclipse_phase, midpoint), period, midpoint, m_star, r_star, r_planet, i, primary, b)-width)
+        if test >= 0:
+            left = midpoint
+        else:
+            right = midpoint
+        x += 1
+        if x > 256:
+            break
+    return base_e(eclipse_phase, midpoint), midpoint % 360
+
+# a hot Jupiter around a Sun-like star (SI radii, as aorcalc passes them)
+RS, RP = 6.955e8, 7.1492e7
+
+def test_duration_array():
+    np.random.seed(10)
+    e     = np.r_[0., np.random.uniform(0, 0.5, 50)]
+    omega = np.r_[0., np.random.uniform(0, 360, 50)]
+    incl  = np.r_[np.pi/2, np.random.uniform(1.4, np.pi/2, 50)]
+    for primary in (True, False):
+        for b in (0, 0.3, 1.5):
+            d   = orbit.duration_array(e, 3., omega, 1., RS, RP, incl, primary, b)
+            ref = np.array([base_duration(e[k], 3., omega[k], 1., RS, RP, incl[k], primary, b)
+                            for k in range(len(e))])
+            # impossible occultations are NaN instead of 0
+            assert np.all(np.isnan(d) == (ref == 0))
+            ok = ref != 0
+            assert np.all(np.abs(d[ok] - ref[ok]) < 1e-14 * ref[ok])
+    # circular: the same duration for every omega
+    d = orbit.duration_array(0., 3., np.array([0., 90., 180., 270.]), 1., RS, RP)
+    assert np.max(np.abs(d - d[0])) < 1e-12 * d[0]
+
+def test_e_duration():
+    for e0, omega0, primary in [(0.1, 40., True), (0.3, 200., True), (0.05, 300., False),
+                                (0.2, 0., True), (0.2, 180., False)]:
+        phase = orbit.eclipse_phase(omega0, e0)
+        width = base_duration(e0, 3., omega0, 1., RS, RP, primary=primary)
+        e, omega = orbit.e_duration(phase, width, 3., 1., RS, RP, primary=primary)
+        assert abs(e - e0) < 1e-9
+        assert abs((omega - omega0 + 180) % 360 - 180) < 1e-8
+        # the bisection finds one of the roots, when it converges (it
+        # may end on a jump of e instead)
+        eb, omegab = base_e_duration(phase, width, 3., 1., RS, RP, primary=primary)
+        if abs(phase_residual(eb, phase, omegab)) < 1e-9 and \
+           abs(base_duration(eb, 3., omegab, 1., RS, RP, primary=primary) - width) < 1e-6 * width:
+            es, omegas = orbit.e_duration(phase, width, 3., 1., RS, RP, primary=primary,
+                                          allroots=True)
+            diff = np.abs((omegas - omegab + 180) % 360 - 180)
+            assert np.min(diff) < 1e-8
+            assert abs(es[np.argmin(diff)] - eb) < 1e-9
+
+def test_e_duration_no_root():
+    # no orbit has an eclipse at phase 0.5 that lasts twice as long as a
+    # circular one
+    width = 2 * base_duration(0., 3., 0., 1., RS, RP)
+    e, omega = orbit.e_duration(0.5, width, 3., 1., RS, RP)
+    assert np.isnan(e) and np.isnan(omega)
+    es, omegas = orbit.e_duration(0.5, width, 3., 1., RS, RP, allroots=True)
+    assert len(es) == len(omegas) == 0
+
+def derivative(func, x, h):
+    """
+    Five-point central difference of a scalar function.
+    """
+    return (-func(x + 2*h) + 8*func(x + h) - 8*func(x - h) + func(x - 2*h)) / (12*h)
+
+def test_propagate():
+    # linear functions are exact; the covariance is J C J^T
+    func = lambda x, y: (2*x + 3*y, x - y)
+    values, sigma, jac, cov = orbit.propagate(func, (1., 2.), (0.1, 0.2))
+    assert np.allclose(values, [8., -1.])
+    assert np.allclose(jac, [[2., 3.], [1., -1.]])
+    assert np.allclose(sigma, [np.hypot(0.2, 0.6), np.hypot(0.1, 0.2)])
+    assert np.allclose(cov[0, 1], 2*0.01 - 3*0.04)
+    # parameters without uncertainty (and those at 0) are handled
+    values, sigma = orbit.propagate(lambda x, y: x*np.sin(y), (0., 1.), (0.1, 0))[:2]
+    assert abs(sigma[0] - 0.1*np.sin(1.)) < 1e-12
+
+def base_error_eclipse(e, e_error, omega, omega_error):
+    """
+    orbit.error_eclipse as it was: forward differences.
+    """
+    h = 1e-8
+    sigma = e_error**2*((orbit.eclipse_phase(omega, e+h)-orbit.eclipse_phase(omega, e))/h)**2
+    sigma += omega_error**2*((orbit.eclipse_phase(omega+h, e)-orbit.eclipse_phase(omega, e))/h)**2
+    return sigma**0.5
+
+def test_error_eclipse():
+    for e, omega in [(0.1, 40.), (0., 0.), (0.3, 180.), (0.05, 90.), (0.2, 270.)]:
+        sigma = orbit.error_eclipse(e, 0.01, omega, 5.)
+        # the old forward differences are good to a few 1e-5 ...
+        assert abs(sigma - base_error_eclipse(e, 0.01, omega, 5.)) < 1e-4 * sigma
+        # ... and the central differences to 1e-7
+        dphase = derivative(lambda w: orbit.eclipse_phase(w, e), omega, 1e-4)
+        ref = np.hypot(0.01 * orbit.eclipse_phase_de(omega, e), 5. * dphase)
+        assert abs(sigma - ref) < 1e-7 * ref
+
+def test_error_e():
+    phase, omega = 0.55, 30.
+    e, sigma = orbit.e(phase, omega, 0.001, 2.)
+    assert e == orbit.e(phase, omega)
+    # implicit derivatives of eclipse_phase(omega, e) = phase
+    de = orbit.eclipse_phase_de(omega, e)
+    dw = derivative(lambda w: orbit.eclipse_phase(w, e), omega, 1e-4)
+    assert abs(sigma - np.hypot(0.001 / de, 2. * dw / de)) < 1e-6 * sigma
+
+def test_error_duration():
+    args  = [0.1, 3., 40., 1., RS, RP]
+    sigs  = [0.01, 1e-4, 5., 0.05, 1e7, 1e6]
+    d, sigma = orbit.error_duration(*args, sigma_e=sigs[0], sigma_p=sigs[1], sigma_o=sigs[2],
+                                    sigma_ms=sigs[3], sigma_rs=sigs[4], sigma_rp=sigs[5])
+    assert abs(d - base_duration(*args)) < 1e-12 * d
+    # central differences of the old scalar duration, one parameter at a time
+    var = 0
+    for k in range(len(args)):
+        def func(x):
+            pars = list(args)
+            pars[k] = x
+            return base_duration(*pars)
+        var += (sigs[k] * derivative(func, args[k], 1e-5 * args[k]))**2
+    assert abs(sigma - var**0.5) < 1e-6 * sigma
+
+def test_error_e_duration():
+    e0, omega0 = 0.1, 40.
+    phase = orbit.eclipse_phase(omega0, e0)
+    width = base_duration(e0, 3., omega0, 1., RS, RP)
+    e, sigma_e, omega, sigma_o = orbit.error_e_duration(phase, width, 3., 1., RS, RP,
+                                                        sigma_phi=1e-4, sigma_d=1.)
+    assert abs(e - e0) < 1e-9 and abs(omega - omega0) < 1e-8
+    # central differences of e_duration in phase and width
+    solve = lambda p, w: orbit.e_duration(p, w, 3., 1., RS, RP)
+    dp  = (np.array(solve(phase + 1e-6, width)) - solve(phase - 1e-6, width)) / 2e-6
+    dw  = (np.array(solve(phase, width + 1e-4)) - solve(phase, width - 1e-4)) / 2e-4
+    ref = np.hypot(1e-4 * dp, 1. * dw)
+    assert abs(sigma_e - ref[0]) < 1e-4 * ref[0]
+    assert abs(sigma_o - ref[1]) < 1e-4 * ref[1]
+
+def base_kepler(M, e):
+    """
+    Eccentric anomaly of one mean anomaly, by bisection (the earlier
+    true_anomaly iterated Newton's method, which can diverge for e near 1).
+    """
+    turns = 2*np.pi*np.floor((M + np.pi)/(2*np.pi))
+    m = M - turns
+    left, right = -np.pi, np.pi
+    while right - left > 1e-15:
+        midpoint = (left+right)/2
+        if midpoint - e*np.sin(midpoint) - m > 0:
+            right = midpoint
+        else:
+            left = midpoint
+    return (left+right)/2 + turns
+
+ECC = np.array([0., 1e-8, 0.1, 0.5, 0.9, 0.99, 0.999])
+
+def test_kepler():
+    M = np.linspace(-20, 20, 2001)
+    for e in ECC:
+        E = orbit.kepler(M, e)
+        assert np.max(np.abs(E - e*np.sin(E) - M)) < 1e-13
+    for e in ECC:
+        for m in np.linspace(-20, 20, 41):
+            assert abs(orbit.kepler(m, e) - base_kepler(m, e)) < 1e-12
+
+def test_kepler_edges():
+    M = np.linspace(-20, 20, 101)
+    assert np.max(np.abs(orbit.kepler(M, 0.) - M)) < 1e-14
+    assert np.all(orbit.kepler(0., ECC) == 0)
+    assert np.max(np.abs(orbit.kepler(np.pi, ECC) - np.pi)) < 1e-14
+    # e and M broadcast together
+    assert orbit.kepler(M[:, None], ECC).shape == (101, 7)
+
+def test_true_anomaly():
+    M = np.linspace(-20, 20, 401)
+    for e in ECC[:-1]:
+        E = np.array([base_kepler(m, e) for m in M])
+        ref = 2*np.arctan(((1+e)/(1-e))**0.5*np.tan(E/2))
+        f = orbit.true_anomaly(e, M)
+        assert np.max(np.abs((f - ref + np.pi) % (2*np.pi) - np.pi)) < 1e-10
+
+def base_ecosomega(phase, emin=True):
+    """
+    orbit.ecosomega as it was: the secant method on one phase.
+    """
+    x = np.zeros(50)
+    x[0] = np.pi/2*(phase-0.5)
+    x[1] = np.pi/2*(phase-0.5)-1e-8
+    for i in range(2, 49):
+        # the secant step divides by zero once x has converged
+        with np.errstate(divide='ignore', invalid='ignore'):
+            x[i+1] = x[i] - (orbit.eclipse_phase(0, x[i])-phase)*(x[i]-x[i-1])/((orbit.eclipse_phase(0, x[i])-phase)-(orbit.eclipse_phase(0, x[i-1]) - phase))
+        if round(x[i], 12) == round(x[i-1], 12) or x[i] == 1:
+            if emin == True:
+                return np.abs(x[i-1])
+            else:
+                return x[i-1]
+
+def base_error_ecosomega(transit, eclipse, period, transit_error=0, eclipse_error=0, period_error=0):
+    """
+    orbit.error_ecosomega as it was (always with emin).
+    """
+    h = 1e-8
+    sigma = orbit.observed_phase_error(transit, eclipse, period, transit_error, eclipse_error/period, period_error)**2
+    sigma *= ((base_ecosomega(((transit-eclipse)/period % 1)+h)-base_ecosomega(((transit-eclipse)/period % 1)-h))/(2*h))**2
+    return base_ecosomega(((eclipse - transit)/period) % 1), sigma**0.5
+
+def test_ecosomega():
+    phase = np.linspace(0.01, 0.99, 99)
+    for emin in (True, False):
+        ecos = orbit.ecosomega(phase, emin)
+        ref  = np.array([base_ecosomega(p, emin) for p in phase])
+        assert np.max(np.abs(ecos - ref)) < 1e-10
+        assert orbit.ecosomega(phase[3], emin) == ecos[3]
+    assert abs(orbit.ecosomega(0.5)) < 1e-14
+    # e*cos(omega) has the sign of the phase offset
+    assert np.all(np.sign(orbit.ecosomega(phase, False)) == np.sign(phase - 0.5))
+
+def test_ecosomega_nan():
+    phase = np.array([0.3, np.nan, 0.6])
+    ecos = orbit.ecosomega(phase)
+    assert np.isnan(ecos[1])
+    assert ecos[0] == orbit.ecosomega(0.3) and ecos[2] == orbit.ecosomega(0.6)
+    # no convergence in one step, except where the first guess is exact
+    ecos = orbit.ecosomega(np.array([0.3, 0.5, 0.6]), maxiter=1)
+    assert np.isnan(ecos[0]) and np.isnan(ecos[2])
+    assert ecos[1] == 0
+
+def test_error_ecosomega():
+    transit, period = 2454000.3, 3.5
+    eclipse = transit + period * np.array([0.55, 0.47, 0.61, 10.52])
+    ecos, sigma = orbit.error_ecosomega(transit, eclipse, period, 1e-4, 2e-3, 1e-5)
+    assert ecos.shape == sigma.shape == (4,)
+    for k in range(4):
+        ref = base_error_ecosomega(transit, eclipse[k], period, 1e-4, 2e-3, 1e-5)
+        assert abs(ecos[k] - ref[0]) < 1e-10
+        # the old secant stopped at 12 digits, which the step of 1e-8 in
+        # the derivative amplifies to a few 1e-5
+        assert abs(sigma[k] - ref[1]) < 1e-4 * ref[1]
+        phase = (eclipse[k] - transit) / period % 1
+        dphase = orbit.observed_phase_error(transit, eclipse[k], period, 1e-4, 2e-3/period, 1e-5)
+        assert abs(sigma[k] - dphase * abs(derivative(orbit.ecosomega, phase, 1e-4))) < 1e-6 * sigma[k]
+        assert orbit.error_ecosomega(transit, eclipse[k], period, 1e-4, 2e-3, 1e-5)[1] == sigma[k]
+    # a circular orbit is e*cos(omega) = 0
+    assert orbit.error_ecosomega(transit, transit + period/2, period, 1e-4, 2e-3)[0] < 1e-14
+
+def lstsq_ephemeris(times, errors, epoch):
+    """
+    Weighted least-squares ephemeris and its covariance from
+    np.linalg.lstsq.
+    """
+    A = np.vstack((np.ones(len(epoch)), epoch)).T
+    w = 1/np.asarray(errors)
+    tref = times[0]
+    p = np.linalg.lstsq(A * w[:, None], (times - tref) * w, rcond=None)[0]
+    cov = np.linalg.inv(np.dot(A.T * w**2, A))
+    return p[0] + tref, p[1], cov
+
+def test_fit_ephemeris():
+    np.random.seed(18)
+    epoch  = np.sort(np.random.choice(np.arange(-300, 400), 25, replace=False))
+    errors = np.random.uniform(1e-4, 1e-3, 25)
+    times  = 2454000.123 + 3.5247*epoch + errors*np.random.randn(25)
+    (ttrans, sttrans), (period, speriod), cov, ep = \
+        orbit.fit_ephemeris(times, errors, 3.5247 + 2e-5)
+    # numbered from the most precise measurement
+    assert np.all(ep == epoch - epoch[np.argmin(errors)])
+    rt, rp, rcov = lstsq_ephemeris(times, errors, ep)
+    assert abs(ttrans - rt) < 1e-9 and abs(period - rp) < 1e-12
+    assert np.allclose(cov, rcov, rtol=1e-8, atol=0)
+    assert sttrans == cov[0, 0]**0.5 and speriod == cov[1, 1]**0.5
+    # the same ephemeris numbered from another transit
+    (ttrans2, s2), (period2, sp2), cov2, ep2 = \
+        orbit.fit_ephemeris(times, errors, 3.5247, ttrans_guess=times[0])
+    assert np.all(ep2 == epoch - epoch[0])
+    assert abs(ttrans2 + period2*(ep2 - ep)[0] - ttrans) < 1e-9
+    assert abs(period2 - period) < 1e-12
+
+def test_fit_ephemeris_two_points():
+    # two transits: the line through them, with a single scalar error
+    (ttrans, sttrans), (period, speriod), cov, ep = \
+        orbit.fit_ephemeris([2454000.1, 2454035.35], 1e-3, 3.5)
+    assert list(ep) == [0, 10]
+    assert abs(ttrans - 2454000.1) < 1e-9 and abs(period - 3.525) < 1e-12
+    assert abs(sttrans - 1e-3) < 1e-15 and abs(speriod - 2**0.5*1e-4) < 1e-15
+
+def test_precession_drift():
+    # Mercury: the general-relativistic 43 arcsec per century
+    omega_gr = orbit.precession_drift(1., 1.7e-4, 0.034, 87.969, 0.2056, 0., 1.)[0]
+    assert abs(omega_gr * 100 * 3600 - 43.0) < 0.1
+    # WASP-12b: tides dominate, at about 20 degrees per year (Ragozzine &
+    # Wolf 2009), against a GR rate of about 0.2 degrees per year
+    omega_gr, omega_tidal, drift = orbit.precession_drift(1.35, 1.41, 1.79, 1.0914,
+                                                          0.05, 90., 1.)
+    assert abs(omega_gr - 0.21) < 0.01
+    assert abs(omega_tidal - 20.) < 2.
+    # the eclipse moves by the change of its phase
+    dphase = orbit.eclipse_phase(90. + omega_gr + omega_tidal, 0.05) - orbit.eclipse_phase(90., 0.05)
+    assert abs(drift - dphase * 1.0914 * 86400) < 1e-6
+    # all arguments may be arrays
+    assert orbit.precession_drift(np.array([1., 1.35]), 1.41, 1.79, 1.0914, 0.05, 90., 1.)[2].shape == (2,)
+
+def test_cache():
+    orbit.disable_cache()
+    try:
+        orbit.enable_cache(maxsize=3)
+        value = orbit.eclipse_phase(40., 0.1)
+        assert orbit.eclipse_phase(40., 0.1) == value
+        assert orbit.eclipse_phase(omega=40., e=0.1) == value
+        info = orbit.cache_info()
+        assert (info['hits'], info['misses'], info['size'], info['maxsize']) == (2, 1, 1, 3)
+        # positional, keyword, and default arguments bind to the same key
+        d = orbit.duration(0.1, 3., 40., 1., RS, RP)
+        assert orbit.duration(0.1, 3., 40., 1., RS, RP, np.pi/2) == d
+        assert orbit.duration(0.1, 3., 40., 1., RS, RP, i=np.pi/2, b=0) == d
+        assert orbit.duration(r_planet=RP, r_star=RS, m_star=1., omega=40., period=3., e=0.1) == d
+        assert orbit.cache_info()['hits'] == 5 and orbit.cache_info()['misses'] == 2
+        # arrays bypass the cache
+        omega = np.array([40., 50.])
+        assert np.all(orbit.eclipse_phase(omega, 0.1)[:1] == value)
+        assert orbit.cache_info()['size'] == 2 and orbit.cache_info()['misses'] == 2
+        # the least recently used entry goes first: eclipse_phase(40., 0.1)
+        # was used before duration, so it is dropped
+        orbit.eclipse_phase(50., 0.1)
+        orbit.eclipse_phase(60., 0.1)
+        assert orbit.cache_info()['size'] == 3
+        orbit.duration(0.1, 3., 40., 1., RS, RP)
+        orbit.eclipse_phase(40., 0.1)
+        info = orbit.cache_info()
+        assert (info['hits'], info['misses'], info['size']) == (6, 5, 3)
+        # bad calls still raise
+        try:
+            orbit.eclipse_phase(40., 0.1, e=0.2)
+        except TypeError:
+            pass
+        else:
+            assert False
+        # the cached values are the uncached ones
+        orbit.disable_cache()
+        info = orbit.cache_info()
+        assert (info['hits'], info['misses'], info['size']) == (0, 0, 0)
+        assert orbit.eclipse_phase(40., 0.1) == value
+        assert orbit.duration(0.1, 3., 40., 1., RS, RP, i=np.pi/2) == d
+        assert orbit.cache_info()['misses'] == 0
+    finally:
+        orbit.disable_cache()
+
+def test_error_e_duration_bracket():
+    # a solution half a degree from where e reaches 1 (omega = 90 at this
+    # phase): the bracket of the perturbed solutions leaves the orbits
+    # with that phase, so the uncertainties are undefined
+    phase = 0.52
+    for omega0, defined in [(89., True), (89.5, False)]:
+        e0 = orbit.e_array(phase, omega0)[0]
+        width = orbit.duration_array(e0, 3., omega0, 1., RS, RP)
+        e, sigma_e, omega, sigma_o = orbit.error_e_duration(phase, width, 3., 1., RS, RP,
+                                                            sigma_phi=1e-4, sigma_d=1.)
+        assert abs(e - e0) < 1e-9 and abs(omega - omega0) < 1e-8
+        assert np.isfinite(sigma_e) == np.isfinite(sigma_o) == defined
+    # and no solution at all
+    width = 2 * base_duration(0., 3., 0., 1., RS, RP)
+    assert np.all(np.isnan(orbit.error_e_duration(0.5, width, 3., 1., RS, RP, sigma_d=1.)))
+
+def base_ephemeris(period, current_JD, epoch, n_predictions, eclipse_phase):
+    """
+    orbit.ephemeris as it was: steps the transit forward one period at
+    a time.
+    """
+    dates = np.zeros(n_predictions)
+    while current_JD > epoch:
+        epoch += period
+    for n in range(0, n_predictions):
+        dates[n] = epoch+(eclipse_phase*period)+n*period
+    return dates
+
+def test_ephemeris():
+    np.random.seed(17)
+    period  = np.random.uniform(0.8, 10, 30)
+    epoch   = 2454000. + np.random.uniform(0, 10, 30)
+    current = 2455600. + np.random.uniform(0, 10, 30)
+    phase   = np.random.uniform(0.3, 0.7, 30)
+    for k in range(30):
+        dates = orbit.ephemeris(period[k], current[k], epoch[k], 12, phase[k])
+        ref = base_ephemeris(period[k], current[k], epoch[k], 12, phase[k])
+        assert dates.shape == (12,)
+        # the loop accumulates up to half a unit in the last place of the
+        # date per period it steps (some 1e-7 days over a thousand periods)
+        steps = np.ceil((current[k] - epoch[k]) / period[k])
+        assert np.max(np.abs(dates - ref)) < steps * np.spacing(current[k])
+    # a transit epoch after the current date is the first prediction
+    assert np.all(orbit.ephemeris(3., 2454000., 2454010., 3, 0.5) == 2454010. + np.array([1.5, 4.5, 7.5]))
+
+def test_ephemeris_broadcast():
+    np.random.seed(17)
+    period = np.random.uniform(0.8, 10, 5)
+    epoch  = 2454000. + np.random.uniform(0, 10, 5)
+    phase  = np.random.uniform(0.3, 0.7, 5)
+    # one row of predictions per planet, for one current date or one each
+    dates = orbit.ephemeris(period, 2455600., epoch, 8, phase)
+    assert dates.shape == (5, 8)
+    for k in range(5):
+        assert np.all(dates[k] == orbit.ephemeris(period[k], 2455600., epoch[k], 8, phase[k]))
+    assert orbit.ephemeris(period, 2455600. + np.arange(5.), epoch, 8, phase).shape == (5, 8)
+    assert np.all(np.diff(dates, axis=1) > 0) and np.all(dates[:, 0] >= 2455600.)
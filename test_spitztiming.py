@@ -0,0 +1,54 @@
+# regression checks of spitztiming against a scalar datetime reference;
+# run with py.test from this directory.
+import datetime
+import numpy as np
+import spitztiming as st
+
+# Julian date of 2000 Jan 1, 12:00
+J2000 = 2451545.0
+
+def reference(jd):
+    """
+    The timing constraint date and time of one Julian date, rounded to
+    the nearest second, from datetime.
+    """
+    t = datetime.datetime(2000, 1, 1, 12) + datetime.timedelta(days=jd - J2000)
+    if t.microsecond >= 500000:
+        t += datetime.timedelta(seconds=1)
+    t = t.replace(microsecond=0)
+    return '%d %s %2d' % (t.year, t.strftime('%b'), t.day), t.strftime('%H:%M:%S')
+
+def constraint(k, jdstart, jdend):
+    sdate, stime = reference(jdstart)
+    edate, etime = reference(jdend)
+    return 'TIMING%d:  START_DATE=%s, START_TIME=%8s, END_DATE=%s, END_TIME=%s' % \
+           (k, sdate, stime, edate, etime)
+
+def test_random_times():
+    np.random.seed(8)
+    jdstart = J2000 + np.random.uniform(0, 20 * 365.25, 2000)
+    jdend   = jdstart + np.random.uniform(0, 0.1, 2000)
+    tlist   = st.spitztiming(jdstart, jdend)
+    assert len(tlist) == 2000
+    for k in range(len(tlist)):
+        assert tlist[k] == constraint(k + 1, jdstart[k], jdend[k])
+
+def test_rollover():
+    # half a second or less before midnight rounds up to the next day,
+    # including the last day of a month and of a year
+    s = 1 / 86400.
+    midnights = J2000 + 0.5 + np.array([0, 30, 365, 366, 1826])  # Jan 2, Jan 31, 2001 Jan 1, ...
+    jdstart   = np.concatenate([midnights - 0.4 * s, midnights - 0.6 * s, midnights - 60.4 * s])
+    jdend     = jdstart + 0.4 * s
+    tlist     = st.spitztiming(jdstart, jdend)
+    for k in range(len(tlist)):
+        assert tlist[k] == constraint(k + 1, jdstart[k], jdend[k])
+        assert '24:00:00' not in tlist[k]
+        assert ':60' not in tlist[k]
+    assert 'START_DATE=2001 Jan  1, START_TIME=00:00:00' in tlist[2]
+    assert 'START_DATE=2000 Dec 31, START_TIME=23:59:59' in tlist[7]
+    assert 'START_TIME=23:59:00' in tlist[10]
+
+def test_scalar():
+    jd = J2000 + 0.25
+    assert st.spitztiming(jd, jd + 0.01) == [constraint(1, jd, jd + 0.01)]